@@ -0,0 +1,200 @@
+"""Benchmarks for the grading, aggregation and transcript rendering hot paths.
+
+    python -m benchmarks                        # 1k, 100k and 10M enrollments
+    python -m benchmarks --sizes 1000,100000
+    python -m benchmarks --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json
+
+Each benchmark reports the best of --repeat timed runs as throughput
+(items/s; reruns/s for transcript_rerun) plus the peak traced memory of
+one extra run. Per-course benchmarks are skipped above PER_COURSE_LIMIT,
+so only the batch path runs at 10M. With --compare the exit status is 1
+if any throughput drops more than --tolerance below the baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from benchmarks.cohort import make_cohort
+from gpa_calculator import GPACalculator
+from gpa_calculator.batch import BatchTotals, summarize
+from gpa_calculator.transcript import TranscriptTracker
+
+# Per-course (one Python call per row) benchmarks are skipped above this size
+PER_COURSE_LIMIT = 1_000_000
+
+def bench_lookup(calculator, cohort):
+    lookup = calculator.get_grade_from_percentage
+    total_marks = [calculator.get_mark_split(credits)[3] for credits in cohort['credits'].tolist()]
+    obtained = (cohort['mids'] + cohort['final'] + cohort['sectional']).tolist()
+    percentages = [marks / total * 100 for marks, total in zip(obtained, total_marks)]
+    def run():
+        for percentage in percentages:
+            lookup(percentage)
+    return run, len(percentages)
+
+def bench_calculate_from_marks(calculator, cohort):
+    rows = list(zip(cohort['credits'].tolist(), cohort['mids'].tolist(),
+                    cohort['final'].tolist(), cohort['sectional'].tolist()))
+    def run():
+        for credits, mids, final, sectional in rows:
+            calculator.calculate_from_marks("Course", credits, mids, final, sectional)
+    return run, len(rows)
+
+def bench_grade_frame(calculator, cohort):
+    import pandas as pd
+    frame = pd.DataFrame(cohort)
+    def run():
+        calculator.grade_frame(frame)
+    return run, len(frame)
+
+def bench_batch_totals(calculator, cohort):
+    import pandas as pd
+    graded = calculator.grade_frame(pd.DataFrame(cohort))
+    def run():
+        totals = BatchTotals()
+        totals.add(summarize(graded))
+        totals.to_frame()
+    return run, len(graded)
+
+def _course_inputs(cohort, count):
+    inputs = []
+    for i in range(count):
+        if cohort['grade'][i] is not None:
+            inputs.append({"name": f"Course {i}", "credits": int(cohort['credits'][i]),
+                           "grade": cohort['grade'][i], "method": "grade"})
+        else:
+            inputs.append({"name": f"Course {i}", "credits": int(cohort['credits'][i]),
+                           "mids": float(cohort['mids'][i]), "final": float(cohort['final'][i]),
+                           "sectional": float(cohort['sectional'][i]),
+                           "obtained": float(cohort['mids'][i]), "method": "marks"})
+    return inputs
+
+def bench_transcript_rerun(calculator, cohort):
+    # Streamlit reruns of a 60 course transcript where one course changed,
+    # one rerun per 100 enrollments
+    inputs = _course_inputs(cohort, 60)
+    tracker = TranscriptTracker(calculator)
+    tracker.update(inputs)
+    reruns = max(1, len(cohort['credits']) // 100)
+    def run():
+        for i in range(reruns):
+            course = inputs[i % 60]
+            course["name"] = f"Course {i}"
+            tracker.update(inputs)
+    return run, reruns
+
+def _table_rows(courses):
+    # Table rows as built for st.table in the app
+    return [{
+        "Course": course.name,
+        "Grade": f"{course.grade_letter}",
+        "Grade Points": f"{course.grade_value:.2f}",
+        "Credits": f"{course.credit_hours:.0f}",
+        "Quality Points": f"{course.quality_points:.2f}",
+        "Percentage": f"{course.percentage:.1f}%"
+    } for course in courses]
+
+def bench_transcript_table(calculator, cohort):
+    # Table rows and DataFrame as built for st.table, one row per enrollment
+    import pandas as pd
+    courses = TranscriptTracker(calculator).update(_course_inputs(cohort, len(cohort['credits'])))
+    def run():
+        pd.DataFrame(_table_rows(courses))
+    return run, len(courses)
+
+def bench_st_table(calculator, cohort):
+    # st.table itself, which serializes the DataFrame to Arrow on every
+    # rerun; in bare mode nothing is sent, but the work is the same
+    import pandas as pd
+    import streamlit as st
+    from streamlit.logger import set_log_level
+    courses = TranscriptTracker(calculator).update(_course_inputs(cohort, len(cohort['credits'])))
+    frame = pd.DataFrame(_table_rows(courses))
+    # Bare mode warns about the missing script context on every call; the
+    # first call loads Streamlit's config, which resets the log level
+    st.table(frame.head(1))
+    set_log_level('error')
+    def run():
+        st.table(frame)
+    return run, len(frame)
+
+# name -> (setup, runs one Python call per row)
+BENCHMARKS = {
+    'get_grade_from_percentage': (bench_lookup, True),
+    'calculate_from_marks': (bench_calculate_from_marks, True),
+    'grade_frame': (bench_grade_frame, False),
+    'batch_totals': (bench_batch_totals, False),
+    'transcript_rerun': (bench_transcript_rerun, True),
+    'transcript_table': (bench_transcript_table, True),
+    'st_table': (bench_st_table, True),
+}
+
+def measure(run, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': best, 'throughput': items / best, 'peak_mb': peak / 2**20}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,10000000", help="Comma-separated cohort sizes")
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed throughput drop against the baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    calculator = GPACalculator()
+    results = {}
+    
+    print(f"{'benchmark':<28}{'size':>10}{'seconds':>10}{'items/s':>14}{'peak MB':>10}")
+    for size in sizes:
+        cohort = make_cohort(size)
+        for name in names:
+            setup, per_course = BENCHMARKS[name]
+            if per_course and size > PER_COURSE_LIMIT:
+                continue
+            run, items = setup(calculator, cohort)
+            result = measure(run, items, args.repeat)
+            results[f"{name}[{size}]"] = result
+            print(f"{name:<28}{size:>10}{result['seconds']:>10.3f}"
+                  f"{result['throughput']:>14,.0f}{result['peak_mb']:>10.1f}")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = []
+        for key, result in results.items():
+            if key in baseline:
+                ratio = result['throughput'] / baseline[key]['throughput']
+                if ratio < 1 - args.tolerance:
+                    regressions.append((key, ratio))
+        for key, ratio in regressions:
+            print(f"REGRESSION {key}: {ratio:.0%} of baseline throughput")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import numpy as np
+
+def make_cohort(size, seed=0, courses_per_student=40):
+    """Synthetic enrollments: mostly 2/3 credit hour marks-based courses in
+    0.5 mark steps, with some other credit hours and ~10% letter grades"""
+    rng = np.random.default_rng(seed)
+    credits = rng.choice([1, 2, 3, 4], size, p=[0.05, 0.3, 0.6, 0.05])
+    max_mids = np.select([credits == 3, credits == 2], [20, 15], default=100)
+    max_final = np.select([credits == 3, credits == 2], [30, 20], default=0)
+    max_sectional = np.select([credits == 3, credits == 2], [10, 5], default=0)
+    
+    def marks(maximum):
+        return np.floor(rng.random(size) * (maximum * 2 + 1)) / 2
+    
+    grade = np.where(rng.random(size) < 0.1, rng.choice(np.array(list('ABCDF'), dtype=object), size), None)
+    return {
+        'student_id': np.arange(size) // courses_per_student,
+        'course': np.array([f"Course {i}" for i in range(50)], dtype=object)[np.arange(size) % 50],
+        'credits': credits,
+        'mids': marks(max_mids),
+        'final': marks(max_final),
+        'sectional': marks(max_sectional),
+        'grade': grade,
+    }
@@ -6,6 +6,58 @@
 
 using namespace std;
 
+// GCUF Grading System based on percentage
+// (also compiled into the Python extension, see gpa_calculator/_native.cpp)
+double gcufGradePoints(double percentage) {
+    if (percentage >= 85) return 4.00;
+    else if (percentage >= 84) return 3.95;
+    else if (percentage >= 83) return 3.90;
+    else if (percentage >= 82) return 3.85;
+    else if (percentage >= 81) return 3.80;
+    else if (percentage >= 80) return 3.75;
+    else if (percentage >= 79) return 3.70;
+    else if (percentage >= 78) return 3.65;
+    else if (percentage >= 77) return 3.60;
+    else if (percentage >= 76) return 3.55;
+    else if (percentage >= 75) return 3.50;
+    else if (percentage >= 74) return 3.45;
+    else if (percentage >= 73) return 3.40;
+    else if (percentage >= 72) return 3.35;
+    else if (percentage >= 71) return 3.30;
+    else if (percentage >= 70) return 3.25;
+    else if (percentage >= 69) return 3.20;
+    else if (percentage >= 68) return 3.15;
+    else if (percentage >= 67) return 3.10;
+    else if (percentage >= 66) return 3.05;
+    else if (percentage >= 65) return 3.00;
+    else if (percentage >= 64) return 2.94;
+    else if (percentage >= 63) return 2.88;
+    else if (percentage >= 62) return 2.82;
+    else if (percentage >= 61) return 2.76;
+    else if (percentage >= 60) return 2.70;
+    else if (percentage >= 59) return 2.63;
+    else if (percentage >= 58) return 2.56;
+    else if (percentage >= 57) return 2.49;
+    else if (percentage >= 56) return 2.42;
+    else if (percentage >= 55) return 2.35;
+    else if (percentage >= 54) return 2.28;
+    else if (percentage >= 53) return 2.21;
+    else if (percentage >= 52) return 2.14;
+    else if (percentage >= 51) return 2.07;
+    else if (percentage >= 50) return 2.00;
+    else if (percentage >= 49) return 1.90;
+    else if (percentage >= 48) return 1.80;
+    else if (percentage >= 47) return 1.70;
+    else if (percentage >= 46) return 1.60;
+    else if (percentage >= 45) return 1.50;
+    else if (percentage >= 44) return 1.40;
+    else if (percentage >= 43) return 1.30;
+    else if (percentage >= 42) return 1.20;
+    else if (percentage >= 41) return 1.10;
+    else if (percentage >= 40) return 1.00;
+    else return 0.00;
+}
+
 class Course {
 public:
     string name;
@@ -25,54 +77,7 @@ private:
     void calculateGradePoints() {
         double percentage = (marksObtained / totalMarks) * 100;
         
-        // GCUF Grading System based on percentage
-        if (percentage >= 85) gradePoints = 4.00;
-        else if (percentage >= 84) gradePoints = 3.95;
-        else if (percentage >= 83) gradePoints = 3.90;
-        else if (percentage >= 82) gradePoints = 3.85;
-        else if (percentage >= 81) gradePoints = 3.80;
-        else if (percentage >= 80) gradePoints = 3.75;
-        else if (percentage >= 79) gradePoints = 3.70;
-        else if (percentage >= 78) gradePoints = 3.65;
-        else if (percentage >= 77) gradePoints = 3.60;
-        else if (percentage >= 76) gradePoints = 3.55;
-        else if (percentage >= 75) gradePoints = 3.50;
-        else if (percentage >= 74) gradePoints = 3.45;
-        else if (percentage >= 73) gradePoints = 3.40;
-        else if (percentage >= 72) gradePoints = 3.35;
-        else if (percentage >= 71) gradePoints = 3.30;
-        else if (percentage >= 70) gradePoints = 3.25;
-        else if (percentage >= 69) gradePoints = 3.20;
-        else if (percentage >= 68) gradePoints = 3.15;
-        else if (percentage >= 67) gradePoints = 3.10;
-        else if (percentage >= 66) gradePoints = 3.05;
-        else if (percentage >= 65) gradePoints = 3.00;
-        else if (percentage >= 64) gradePoints = 2.94;
-        else if (percentage >= 63) gradePoints = 2.88;
-        else if (percentage >= 62) gradePoints = 2.82;
-        else if (percentage >= 61) gradePoints = 2.76;
-        else if (percentage >= 60) gradePoints = 2.70;
-        else if (percentage >= 59) gradePoints = 2.63;
-        else if (percentage >= 58) gradePoints = 2.56;
-        else if (percentage >= 57) gradePoints = 2.49;
-        else if (percentage >= 56) gradePoints = 2.42;
-        else if (percentage >= 55) gradePoints = 2.35;
-        else if (percentage >= 54) gradePoints = 2.28;
-        else if (percentage >= 53) gradePoints = 2.21;
-        else if (percentage >= 52) gradePoints = 2.14;
-        else if (percentage >= 51) gradePoints = 2.07;
-        else if (percentage >= 50) gradePoints = 2.00;
-        else if (percentage >= 49) gradePoints = 1.90;
-        else if (percentage >= 48) gradePoints = 1.80;
-        else if (percentage >= 47) gradePoints = 1.70;
-        else if (percentage >= 46) gradePoints = 1.60;
-        else if (percentage >= 45) gradePoints = 1.50;
-        else if (percentage >= 44) gradePoints = 1.40;
-        else if (percentage >= 43) gradePoints = 1.30;
-        else if (percentage >= 42) gradePoints = 1.20;
-        else if (percentage >= 41) gradePoints = 1.10;
-        else if (percentage >= 40) gradePoints = 1.00;
-        else gradePoints = 0.00;
+        gradePoints = gcufGradePoints(percentage);
     }
 };
 
@@ -189,6 +194,7 @@ private:
     }
 };
 
+#ifndef GPA_CALCULATOR_NO_MAIN
 int main() {
     GPACalculator calculator;
     int numCourses;
@@ -208,4 +214,5 @@ int main() {
     calculator.calculateGPA();
     
     return 0;
-}
\ No newline at end of file
+}
+#endif
\ No newline at end of file
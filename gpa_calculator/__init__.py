@@ -0,0 +1,9 @@
+from gpa_calculator import instrumentation
+from gpa_calculator.scales import GradingScale, GradingPolicy, ScaleRegistry, get_policy, registry
+from gpa_calculator.grading import Course, GPACalculator
+from gpa_calculator.records import CourseRecord, CourseTable
+from gpa_calculator.cache import GradingCache
+from gpa_calculator.semesters import AcademicRecord
+from gpa_calculator.planner import PendingCourse, solve_target_gpa
+from gpa_calculator.simulation import BetaMarks, EmpiricalMarks, fit_marks, simulate_gpa
+from gpa_calculator.storage import TranscriptStore
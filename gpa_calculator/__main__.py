@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from gpa_calculator import native
+from gpa_calculator.batch import run_batch
+from gpa_calculator.export import FORMATS, export_transcripts
+from gpa_calculator.fixed import validate
+from gpa_calculator.grading import GPACalculator
+from gpa_calculator.scales import registry
+from gpa_calculator.service import GradingService, serve
+from gpa_calculator.storage import TranscriptStore
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m gpa_calculator",
+        description="Headless GPA calculator using the GCUF grading scale"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    batch = commands.add_parser(
+        "batch",
+        help="Grade an enrollment file (CSV or Parquet)",
+        description="Columns: student_id, course, credits, mids, final, sectional "
+                    "and optionally grade (A-F) for grade-based courses."
+    )
+    batch.add_argument("input", help="Enrollment records (.csv or .parquet)")
+    batch.add_argument("--transcript", default="transcript.csv", help="Per-course transcript output (CSV)")
+    batch.add_argument("--summary", default="gpa_summary.csv", help="Per-student GPA output (CSV)")
+    batch.add_argument("--chunk-size", type=int, default=100_000, help="Records read per chunk")
+    batch.add_argument("-j", "--workers", type=int, default=1, help="Worker processes (default: 1)")
+    batch.add_argument("--scale", default="gcuf", help="Grading scale name (default: gcuf)")
+    batch.add_argument("--exact", action="store_true",
+                       help="Grade in exact integer hundredths instead of floats")
+    batch.add_argument("--scale-file", action="append", default=[],
+                       help="Extra JSON/YAML scale definition to load (repeatable)")
+    
+    store = commands.add_parser("store", help="Grade an enrollment file into a SQLite transcript database")
+    store.add_argument("input", help="Enrollment records (.csv or .parquet)")
+    store.add_argument("--db", default="transcripts.sqlite", help="SQLite database path")
+    store.add_argument("--term", help="Term for all rows, overriding any 'term' column")
+    store.add_argument("--chunk-size", type=int, default=100_000, help="Records read per chunk")
+    store.add_argument("--scale", default="gcuf", help="Grading scale name (default: gcuf)")
+    store.add_argument("--exact", action="store_true",
+                       help="Grade in exact integer hundredths instead of floats")
+    store.add_argument("--scale-file", action="append", default=[],
+                       help="Extra JSON/YAML scale definition to load (repeatable)")
+    
+    server = commands.add_parser("serve", help="Run the HTTP grading API")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8000)
+    server.add_argument("--scale", default="gcuf", help="Grading scale name (default: gcuf)")
+    server.add_argument("--exact", action="store_true",
+                        help="Grade in exact integer hundredths instead of floats")
+    server.add_argument("--scale-file", action="append", default=[],
+                       help="Extra JSON/YAML scale definition to load (repeatable)")
+    server.add_argument("--max-batch", type=int, default=50_000, help="Most courses graded per micro-batch")
+    server.add_argument("--max-wait-ms", type=float, default=2.0, help="Longest wait to fill a micro-batch")
+    server.add_argument("--max-pending", type=int, default=1_000, help="Queued requests before rejecting with 503")
+    
+    export = commands.add_parser(
+        "export",
+        help="Write per-student transcripts (CSV/JSON/PDF) to a directory or .zip",
+        description="Input is a transcript database from 'store' (.sqlite/.db) or an enrollment "
+                    "file, which is graded into a temporary database first."
+    )
+    export.add_argument("input", help="Transcript database or enrollment records (.csv or .parquet)")
+    export.add_argument("--out", default="transcripts.zip", help="Output directory, or a .zip file")
+    export.add_argument("--format", action="append", choices=FORMATS, dest="formats",
+                        help="Document format (repeatable, default: all)")
+    export.add_argument("-j", "--workers", type=int, default=1, help="Worker processes (default: 1)")
+    export.add_argument("--term", help="Term for all rows of an enrollment file, overriding any 'term' column")
+    export.add_argument("--chunk-size", type=int, default=100_000, help="Records read per chunk")
+    export.add_argument("--scale", default="gcuf", help="Grading scale name (default: gcuf)")
+    export.add_argument("--exact", action="store_true",
+                        help="Grade in exact integer hundredths instead of floats")
+    export.add_argument("--scale-file", action="append", default=[],
+                        help="Extra JSON/YAML scale definition to load (repeatable)")
+    
+    check = commands.add_parser(
+        "exact-check",
+        help="Compare exact fixed-point grading with the float path over exhaustive mark grids"
+    )
+    check.add_argument("--step", type=float, default=0.5, help="Mark increment for the (mids, final, sectional) grid")
+    check.add_argument("--scale", default="gcuf", help="Grading scale name (default: gcuf)")
+    check.add_argument("--scale-file", action="append", default=[],
+                       help="Extra JSON/YAML scale definition to load (repeatable)")
+    
+    compiled = commands.add_parser("native", help="Build or check the optional compiled grading kernel")
+    compiled.add_argument("action", choices=["build", "check"],
+                          help="build: compile it in place; check: compare it with every registered scale")
+    compiled.add_argument("--scale-file", action="append", default=[],
+                          help="Extra JSON/YAML scale definition to load (repeatable)")
+    
+    args = parser.parse_args(argv)
+    
+    for path in args.scale_file:
+        registry.load(path)
+    
+    if args.command == "batch":
+        calculator = GPACalculator(args.scale, args.exact)
+        
+        start = time.perf_counter()
+        rows, students, worker_stats = run_batch(
+            args.input, args.transcript, args.summary, args.chunk_size,
+            calculator=calculator, workers=args.workers
+        )
+        elapsed = time.perf_counter() - start
+        print(f"Graded {rows} enrollments for {students} students in {elapsed:.2f}s", file=sys.stderr)
+        for pid, (count, seconds) in sorted(worker_stats.items()):
+            rate = count / seconds if seconds > 0 else 0
+            print(f"  worker {pid}: {count} enrollments in {seconds:.2f}s ({rate:,.0f}/s)", file=sys.stderr)
+    elif args.command == "store":
+        start = time.perf_counter()
+        with TranscriptStore(args.db, GPACalculator(args.scale, args.exact)) as store:
+            try:
+                rows = store.import_enrollments(args.input, args.term, args.chunk_size)
+            except ValueError as error:
+                parser.error(f"{error} (or pass --term)")
+        elapsed = time.perf_counter() - start
+        print(f"Stored {rows} graded enrollments in {args.db} in {elapsed:.2f}s", file=sys.stderr)
+    elif args.command == "serve":
+        service = GradingService(
+            GPACalculator(args.scale, args.exact), args.max_batch, args.max_wait_ms / 1000, args.max_pending
+        )
+        print(f"Serving grading API on http://{args.host}:{args.port}", file=sys.stderr)
+        try:
+            asyncio.run(serve(service, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "export":
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory() as scratch:
+            if os.path.splitext(args.input)[1].lower() in (".sqlite", ".db"):
+                db = args.input
+            else:
+                # Staging through SQLite keeps memory bounded however the
+                # enrollment rows are ordered
+                db = os.path.join(scratch, "transcripts.sqlite")
+                with TranscriptStore(db, GPACalculator(args.scale, args.exact)) as store:
+                    try:
+                        store.import_enrollments(args.input, args.term, args.chunk_size)
+                    except ValueError as error:
+                        parser.error(f"{error} (or pass --term)")
+            with TranscriptStore(db, GPACalculator(args.scale, args.exact)) as store:
+                students, files = export_transcripts(
+                    store.iter_transcripts(), args.out, args.formats or FORMATS, args.workers, exact=args.exact
+                )
+        elapsed = time.perf_counter() - start
+        print(f"Wrote {files} documents for {students} students to {args.out} in {elapsed:.2f}s", file=sys.stderr)
+    elif args.command == "exact-check":
+        size, fixed_errors, float_differences = validate(registry.get(args.scale), args.step)
+        print(f"{args.scale}: graded {size} mark combinations")
+        print(f"  fixed-point vs exact rational percentages: {len(fixed_errors)} errors")
+        for credits, obtained, percentage, exact in fixed_errors[:10]:
+            print(f"    {credits} cr, {obtained:.2f} marks: {percentage / 100:.2f}% instead of {exact / 100:.2f}%")
+        # The float path allows for drift (scales.DRIFT), so this should be 0 too
+        print(f"  float path in a different band: {len(float_differences)}")
+        for credits, mids, final, sectional, float_points, exact_points in float_differences[:10]:
+            print(f"    {credits} cr, {mids:g}/{final:g}/{sectional:g}: float {float_points:.2f}, exact {exact_points:.2f}")
+        return 1 if fixed_errors else 0
+    elif args.command == "native":
+        if args.action == "build":
+            print(f"Built {native.build()}", file=sys.stderr)
+            return 0
+        if not native.available():
+            print("Native kernel is not built (python -m gpa_calculator native build)", file=sys.stderr)
+            return 1
+        # The kernel must match the GCUF scale it was written for on every
+        # 0.01% step; other scales simply keep using the Python lookup
+        status = 0
+        for name in registry.names():
+            scale = registry.get(name).scale
+            steps = round(scale.max_percentage * 100) + 1
+            if scale.resolution != 100:
+                print(f"{name}: resolution {scale.resolution}, uses the Python lookup")
+                continue
+            differences = native.mismatches(scale)
+            if not differences:
+                print(f"{name}: native kernel agrees on all {steps} steps")
+                continue
+            print(f"{name}: {len(differences)} differences, uses the Python lookup")
+            for percentage, expected, points in differences[:10]:
+                print(f"  {percentage:.2f}%: python {expected:.2f}, native {points:.2f}")
+            if name == "gcuf":
+                status = 1
+        return status
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+// Python extension exposing the GCUF grading ladder from gpa_calculator.cpp.
+//
+// Built in place with `python -m gpa_calculator native build`; see
+// gpa_calculator/native.py for the Python side and the pure-Python fallback.
+// Inputs and outputs are taken through the buffer protocol (e.g. numpy
+// float64 arrays), so nothing is copied and the GIL is released while grading.
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <cmath>
+#include <cstring>
+
+#define GPA_CALCULATOR_NO_MAIN
+#include "../gpa_calculator.cpp"
+
+// Get a 1-d contiguous float64 buffer, or set TypeError and return -1
+static int get_doubles(PyObject *obj, Py_buffer *view, int writable, const char *name) {
+    int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | (writable ? PyBUF_WRITABLE : 0);
+    if (PyObject_GetBuffer(obj, view, flags) < 0) {
+        return -1;
+    }
+    const char *format = view->format ? view->format : "B";
+    if (*format == '<' || *format == '=' || *format == '@') {
+        format++;
+    }
+    if (view->ndim != 1 || view->itemsize != sizeof(double) || strcmp(format, "d") != 0) {
+        PyErr_Format(PyExc_TypeError, "%s must be a 1-d contiguous float64 buffer", name);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *grade_into(PyObject *self, PyObject *args) {
+    PyObject *percentages_obj, *credits_obj, *points_obj, *quality_obj;
+    double max_percentage;
+    if (!PyArg_ParseTuple(args, "OOOOd", &percentages_obj, &credits_obj, &points_obj, &quality_obj, &max_percentage)) {
+        return NULL;
+    }
+
+    Py_buffer percentages, credits, points, quality;
+    int with_credits = credits_obj != Py_None;
+    if (get_doubles(percentages_obj, &percentages, 0, "percentages") < 0) {
+        return NULL;
+    }
+    if (get_doubles(points_obj, &points, 1, "grade_points") < 0) {
+        PyBuffer_Release(&percentages);
+        return NULL;
+    }
+    if (with_credits) {
+        if (get_doubles(credits_obj, &credits, 0, "credits") < 0) {
+            PyBuffer_Release(&percentages);
+            PyBuffer_Release(&points);
+            return NULL;
+        }
+        if (get_doubles(quality_obj, &quality, 1, "quality_points") < 0) {
+            PyBuffer_Release(&percentages);
+            PyBuffer_Release(&points);
+            PyBuffer_Release(&credits);
+            return NULL;
+        }
+    }
+
+    Py_ssize_t n = percentages.shape[0];
+    PyObject *result = NULL;
+    if (points.shape[0] != n || (with_credits && (credits.shape[0] != n || quality.shape[0] != n))) {
+        PyErr_SetString(PyExc_ValueError, "all arrays must have the same length");
+    } else {
+        const double *p = (const double *) percentages.buf;
+        double max_hundredths = std::round(max_percentage * 100);
+        double *out = (double *) points.buf;
+        Py_BEGIN_ALLOW_THREADS
+        for (Py_ssize_t i = 0; i < n; i++) {
+            // Same rules as GradingScale.lookup: out-of-range (and NaN)
+            // percentages get 0.00, the rest are truncated to hundredths
+            // after allowing for float drift (scales.DRIFT)
+            double percentage = p[i];
+            double scaled = percentage * 100;
+            if (percentage >= 0 && scaled <= max_hundredths + 1e-6) {
+                out[i] = gcufGradePoints(std::floor(scaled + 1e-6) / 100);
+            } else {
+                out[i] = 0.00;
+            }
+        }
+        if (with_credits) {
+            const double *c = (const double *) credits.buf;
+            double *q = (double *) quality.buf;
+            for (Py_ssize_t i = 0; i < n; i++) {
+                q[i] = out[i] * c[i];
+            }
+        }
+        Py_END_ALLOW_THREADS
+        result = Py_None;
+        Py_INCREF(result);
+    }
+
+    PyBuffer_Release(&percentages);
+    PyBuffer_Release(&points);
+    if (with_credits) {
+        PyBuffer_Release(&credits);
+        PyBuffer_Release(&quality);
+    }
+    return result;
+}
+
+static PyMethodDef methods[] = {
+    {"grade_into", grade_into, METH_VARARGS,
+     "grade_into(percentages, credits, grade_points, quality_points, max_percentage)\n\n"
+     "Grade percentages with the GCUF scale, writing grade points (and, unless\n"
+     "credits is None, quality points) into the given float64 buffers."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT, "_native", "Compiled GCUF grading kernel", -1, methods
+};
+
+PyMODINIT_FUNC PyInit__native(void) {
+    return PyModule_Create(&module);
+}
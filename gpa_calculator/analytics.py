@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from gpa_calculator.batch import BatchTotals, read_enrollments, summarize
+
+class CohortAggregates:
+    """Grade distribution aggregates for a batch-graded cohort.
+    
+    Graded chunks (from GPACalculator.grade_frame) are folded in once with
+    add(); only counts per (course, section, grade points) and per (course,
+    section, letter) plus one running total per student are kept. All the
+    summary tables are derived from those small aggregates, never from the
+    raw enrollment rows.
+    """
+
+    def __init__(self, calculator):
+        self.calculator = calculator
+        self.band_counts = None
+        self.letter_counts = None
+        self.totals = BatchTotals(calculator.exact)
+        self.enrollments = 0
+
+    def add(self, graded):
+        """Fold a graded chunk into the aggregates"""
+        graded = graded.assign(
+            course=graded['course'].fillna('').astype(str) if 'course' in graded else '',
+            section=graded['section'].fillna('').astype(str) if 'section' in graded else '',
+        )
+        bands = graded.groupby(['course', 'section', 'grade_value']).size()
+        letters = graded.groupby(['course', 'section', 'grade_letter']).size()
+        if self.band_counts is None:
+            self.band_counts, self.letter_counts = bands, letters
+        else:
+            self.band_counts = self.band_counts.add(bands, fill_value=0).astype('int64')
+            self.letter_counts = self.letter_counts.add(letters, fill_value=0).astype('int64')
+        if 'student_id' in graded:
+            self.totals.add(summarize(graded))
+        self.enrollments += len(graded)
+
+    @classmethod
+    def from_file(cls, path, calculator, chunk_size=100_000):
+        """Grade an enrollment CSV/Parquet file chunk by chunk into aggregates"""
+        aggregates = cls(calculator)
+        for chunk in read_enrollments(path, chunk_size):
+            aggregates.add(calculator.grade_frame(chunk))
+        return aggregates
+
+    def _select(self, counts, course=None, section=None):
+        if counts is None:
+            return pd.Series(dtype='int64')
+        if course is not None:
+            counts = counts.xs(course, level='course', drop_level=False)
+        if section is not None:
+            counts = counts.xs(section, level='section', drop_level=False)
+        return counts.groupby(level=2).sum()
+
+    def courses(self):
+        return sorted(self.band_counts.index.get_level_values('course').unique()) if self.band_counts is not None else []
+
+    def sections(self, course):
+        return sorted(self.band_counts.xs(course, level='course').index.get_level_values('section').unique())
+
+    def letter_table(self, course=None, section=None):
+        """Counts per letter grade, best letter first"""
+        counts = self._select(self.letter_counts, course, section)
+        order = list(dict.fromkeys(letter for _, letter in self.calculator.scale.letter_thresholds))
+        order += sorted(set(counts.index) - set(order))
+        counts = counts.reindex(order, fill_value=0)
+        return pd.DataFrame({'letter': counts.index, 'count': counts.to_numpy()})
+
+    def band_table(self, course=None, section=None):
+        """Counts per grade points band, lowest first"""
+        counts = self._select(self.band_counts, course, section)
+        points = [points for _, _, points in self.calculator.scale.bands]
+        counts = counts.reindex(sorted(set(points) | set(counts.index)), fill_value=0)
+        return pd.DataFrame({'grade_points': counts.index, 'count': counts.to_numpy()})
+
+    def course_summary(self):
+        """Enrollments, pass rate and mean grade points per course and section"""
+        if self.band_counts is None:
+            return pd.DataFrame(columns=['course', 'section', 'enrollments', 'pass_rate', 'mean_grade_points'])
+        counts = self.band_counts.rename('count').reset_index()
+        counts['passed'] = np.where(counts['grade_value'] > 0, counts['count'], 0)
+        counts['points'] = counts['grade_value'] * counts['count']
+        summary = counts.groupby(['course', 'section'])[['count', 'passed', 'points']].sum().reset_index()
+        summary['pass_rate'] = summary['passed'] / summary['count']
+        summary['mean_grade_points'] = summary['points'] / summary['count']
+        return summary.rename(columns={'count': 'enrollments'})[
+            ['course', 'section', 'enrollments', 'pass_rate', 'mean_grade_points']
+        ]
+
+    def gpa_histogram(self, bin_width=0.25):
+        """Student counts per GPA bin"""
+        gpas = self.totals.to_frame()['gpa'].to_numpy(dtype=float)
+        top = max(points for _, _, points in self.calculator.scale.bands)
+        edges = np.arange(0, top + bin_width, bin_width)
+        counts, edges = np.histogram(gpas, bins=edges)
+        labels = [f"{low:.2f}–{high:.2f}" for low, high in zip(edges[:-1], edges[1:])]
+        return pd.DataFrame({'gpa': labels, 'students': counts})
@@ -0,0 +1,141 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from gpa_calculator.fixed import gpa
+from gpa_calculator.grading import GPACalculator
+
+# Columns written for every graded enrollment
+TRANSCRIPT_COLUMNS = [
+    'student_id', 'course', 'credits', 'percentage',
+    'grade_value', 'grade_letter', 'quality_points'
+]
+
+SUMMARY_COLUMNS = ['student_id', 'courses', 'total_credits', 'total_quality_points', 'gpa']
+
+def read_enrollments(path, chunk_size=100_000):
+    """Yield enrollment records from a CSV or Parquet file (path or file object) in fixed-size chunks"""
+    name = getattr(path, 'name', path)
+    if os.path.splitext(str(name))[1].lower() in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # Keep IDs as text so e.g. leading zeros in roll numbers survive
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype={'student_id': str, 'course': str})
+
+class BatchTotals:
+    """Running per-student quality points and credits across chunks"""
+
+    def __init__(self, exact=False):
+        # student_id -> [courses, total_credits, quality points in hundredths]
+        self.students = {}
+        # Round GPAs like GPACalculator(exact=True)
+        self.exact = exact
+
+    def add(self, sums):
+        """Fold per-student sums from summarize() into the running totals"""
+        for student_id, courses, credits, quality_points in sums.itertuples():
+            totals = self.students.setdefault(student_id, [0, 0, 0])
+            totals[0] += courses
+            totals[1] += credits
+            totals[2] += quality_points
+
+    def to_frame(self):
+        """Per-student GPA summary in first-seen order"""
+        rows = []
+        for student_id, (courses, credits, hundredths) in self.students.items():
+            rows.append((student_id, courses, credits, hundredths / 100, gpa(hundredths, credits, self.exact)))
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+def summarize(graded):
+    """Per-student course count, credits and quality points for a graded chunk"""
+    # Quality points are summed in integer hundredths so the totals don't
+    # depend on how the input was split into chunks or across workers
+    hundredths = (graded['quality_points'] * 100).round().astype('int64')
+    return graded.assign(quality_points=hundredths).groupby('student_id', sort=False).agg(
+        courses=('credits', 'size'),
+        total_credits=('credits', 'sum'),
+        total_quality_points=('quality_points', 'sum'),
+    )
+
+def grade_chunk(calculator, chunk):
+    """Grade one chunk of enrollment records into transcript rows"""
+    graded = calculator.grade_frame(chunk)
+    return graded[TRANSCRIPT_COLUMNS]
+
+def process_chunk(calculator, chunk):
+    """Grade a chunk and render its transcript rows as CSV text.
+    
+    Returns (pid, seconds, rows, csv_text, sums) so the caller can merge
+    results in input order and report per-worker throughput.
+    """
+    start = time.perf_counter()
+    graded = grade_chunk(calculator, chunk)
+    text = graded.to_csv(header=False, index=False, float_format='%.2f')
+    sums = summarize(graded)
+    return os.getpid(), time.perf_counter() - start, len(graded), text, sums
+
+# Each worker process builds its own calculator once
+_worker_calculator = None
+
+def _init_worker(policy, exact):
+    global _worker_calculator
+    _worker_calculator = GPACalculator(policy, exact)
+
+def _process_in_worker(chunk):
+    return process_chunk(_worker_calculator, chunk)
+
+def _process_parallel(chunks, workers, policy, exact=False):
+    """Process chunks across a pool of workers, yielding results in input order.
+    
+    At most two chunks per worker are in flight so memory stays bounded
+    however large the input is.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(policy, exact)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_process_in_worker, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def run_batch(input_path, transcript_path, summary_path, chunk_size=100_000, calculator=None, workers=1):
+    """Grade an enrollment file chunk by chunk, streaming transcript rows to disk.
+    
+    With workers > 1 the chunks are graded in a process pool and merged back
+    in input order, so the output is identical to a single-process run.
+    Memory stays bounded by the chunk size plus one running total per
+    student. Returns the number of enrollments and students processed and a
+    {pid: [rows, seconds]} dict of per-worker grading time.
+    """
+    calculator = calculator or GPACalculator()
+    chunks = read_enrollments(input_path, chunk_size)
+    if workers > 1:
+        # Workers get the already compiled policy rather than reloading it
+        results = _process_parallel(chunks, workers, calculator.policy, calculator.exact)
+    else:
+        results = (process_chunk(calculator, chunk) for chunk in chunks)
+    
+    totals = BatchTotals(calculator.exact)
+    worker_stats = {}
+    rows = 0
+    
+    with open(transcript_path, 'w', newline='') as transcript:
+        transcript.write(','.join(TRANSCRIPT_COLUMNS) + '\n')
+        for pid, seconds, count, text, sums in results:
+            transcript.write(text)
+            totals.add(sums)
+            stats = worker_stats.setdefault(pid, [0, 0.0])
+            stats[0] += count
+            stats[1] += seconds
+            rows += count
+    
+    summary = totals.to_frame()
+    summary.to_csv(summary_path, index=False, float_format='%.2f')
+    return rows, len(summary), worker_stats
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from gpa_calculator.grading import Course
+
+class GradingCache:
+    """Memoizing, thread-safe wrapper around a GPACalculator.
+    
+    Results of calculate_from_marks and calculate_from_grade are cached by
+    their grading inputs (not the course name) in a bounded LRU, so the
+    same (credits, mids, final, sectional) combination is only graded once.
+    Everything else is delegated to the wrapped calculator, so a cache can
+    be used wherever a GPACalculator is expected.
+    """
+
+    def __init__(self, calculator, maxsize=4096):
+        self.calculator = calculator
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getattr__(self, name):
+        return getattr(self.calculator, name)
+
+    def _get(self, key, grade):
+        with self.lock:
+            course = self.entries.get(key)
+            if course is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return course
+            self.misses += 1
+        
+        # Grade outside the lock; a racing miss just grades twice
+        course = grade()
+        with self.lock:
+            self.entries[key] = course
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return course
+
+    def _copy(self, course, name):
+        # Callers get their own Course so cached results can't be mutated
+        return Course(
+            name=name,
+            credit_hours=course.credit_hours,
+            grade_value=course.grade_value,
+            grade_letter=course.grade_letter,
+            quality_points=course.quality_points,
+            input_method=course.input_method,
+            percentage=course.percentage,
+            marks_details=dict(course.marks_details) if course.marks_details else course.marks_details
+        )
+
+    def calculate_from_grade(self, name, credit_hours, grade_letter):
+        """Cached GPACalculator.calculate_from_grade"""
+        key = ('grade', credit_hours, grade_letter)
+        course = self._get(key, lambda: self.calculator.calculate_from_grade(name, credit_hours, grade_letter))
+        return self._copy(course, name)
+
+    def calculate_from_marks(self, name, credit_hours, mids, final, sectional):
+        """Cached GPACalculator.calculate_from_marks"""
+        key = ('marks', credit_hours, mids, final, sectional)
+        course = self._get(key, lambda: self.calculator.calculate_from_marks(name, credit_hours, mids, final, sectional))
+        return self._copy(course, name)
+
+    def stats(self):
+        """Hit/miss/eviction counters and current size"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
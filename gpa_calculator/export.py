@@ -0,0 +1,293 @@
+"""Per-student transcript documents (CSV, JSON, PDF) and bulk export.
+
+A transcript is rendered from a student's graded Course objects. Bulk
+export takes an iterable of (student_id, name, courses, terms) tuples, for
+example TranscriptStore.iter_transcripts(), renders them across worker
+processes and writes each document to a directory or zip file as soon as
+it is ready, so only the documents in flight are ever held in memory.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from gpa_calculator.fixed import gpa, quality_hundredths
+from gpa_calculator.semesters import AcademicRecord
+
+FORMATS = ('csv', 'json', 'pdf')
+
+TRANSCRIPT_FIELDS = ['Course', 'Grade', 'Grade Points', 'Credits', 'Quality Points', 'Percentage']
+
+def transcript_rows(courses, terms=None):
+    """Transcript table rows as shown in the app, with a Term column when terms are given"""
+    rows = []
+    for i, course in enumerate(courses):
+        row = {} if terms is None else {'Term': terms[i]}
+        row.update({
+            'Course': course.name,
+            'Grade': course.grade_letter,
+            'Grade Points': f"{course.grade_value:.2f}",
+            'Credits': f"{course.credit_hours:.0f}",
+            'Quality Points': f"{course.quality_points:.2f}",
+            'Percentage': f"{course.percentage:.1f}%",
+        })
+        rows.append(row)
+    return rows
+
+def transcript_totals(courses, exact=False):
+    """(total quality points, total credits, GPA) summed in hundredths like the tracker"""
+    hundredths = quality_hundredths(course.quality_points for course in courses)
+    credits = sum(course.credit_hours for course in courses)
+    return hundredths / 100, credits, gpa(hundredths, credits, exact)
+
+def term_gpas(courses, terms, exact=False):
+    """(term, GPA) for each run of courses in the same term, in transcript order"""
+    record = AcademicRecord(exact)
+    for term, group in groupby(zip(terms, courses), key=lambda pair: pair[0]):
+        record.add_term(term, [course for _, course in group])
+    return [(term, record.term_gpa(i)) for i, term in enumerate(record.term_names)]
+
+def render_csv(student_id, courses, name=None, terms=None, exact=False):
+    """Transcript rows as CSV bytes"""
+    rows = transcript_rows(courses, terms)
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=(['Term'] if terms is not None else []) + TRANSCRIPT_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode('utf-8')
+
+def render_json(student_id, courses, name=None, terms=None, exact=False):
+    """Transcript with totals as compact JSON bytes"""
+    quality_points, credits, gpa = transcript_totals(courses, exact)
+    document = {
+        'student_id': student_id,
+        'name': name,
+        'courses': [
+            {
+                **({'term': terms[i]} if terms is not None else {}),
+                'course': course.name,
+                'credits': course.credit_hours,
+                'grade_letter': course.grade_letter,
+                'grade_value': course.grade_value,
+                'quality_points': round(course.quality_points, 2),
+                'percentage': round(float(course.percentage), 2),
+                'input_method': course.input_method,
+            }
+            for i, course in enumerate(courses)
+        ],
+        'total_quality_points': quality_points,
+        'total_credits': credits,
+        'gpa': round(gpa, 2),
+    }
+    if terms is not None:
+        document['term_gpas'] = [{'term': term, 'gpa': round(value, 2)} for term, value in term_gpas(courses, terms, exact)]
+    # No indent, so the C encoder is used
+    return json.dumps(document).encode('utf-8')
+
+def _pdf_text(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def _pdf(lines, lines_per_page=60):
+    """Minimal PDF with the lines set in 10pt Courier, no dependencies needed"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    # Objects 1-3 are the catalog, page tree and font; each page then
+    # takes two objects, the page and its content stream
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page in pages:
+        stream = ["BT /F1 10 Tf 12 TL 50 800 Td"]
+        stream += [f"({_pdf_text(line)}) '" for line in page]
+        stream.append("ET")
+        content = "\n".join(stream).encode('cp1252', 'replace')
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects) + 2} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def render_pdf(student_id, courses, name=None, terms=None, exact=False):
+    """Printable transcript as PDF bytes, laid out like the C++ calculator's report"""
+    quality_points, credits, gpa = transcript_totals(courses, exact)
+    lines = ["=" * 50, "                    GPA TRANSCRIPT", "=" * 50]
+    if name:
+        lines.append(f"Name: {name}")
+    lines += [f"Student ID: {student_id}", ""]
+
+    term_width = max((len(str(term)) for term in terms), default=0) + 2 if terms is not None else 0
+    header = f"{'Term':<{term_width}}" if term_width else ""
+    header += f"{'Course':<30}{'Grade':<7}{'Points':<8}{'Credits':<9}{'Quality Points':<15}"
+    rule = "-" * len(header)
+    lines += [header, rule]
+    for i, course in enumerate(courses):
+        term = f"{str(terms[i]):<{term_width}}" if term_width else ""
+        lines.append(
+            term + f"{course.name[:29]:<30}{course.grade_letter:<7}{course.grade_value:<8.2f}"
+            f"{course.credit_hours:<9.0f}{course.quality_points:<15.2f}"
+        )
+    lines.append(rule)
+    if terms is not None:
+        lines += [f"{f'{term} GPA:':<40}{value:.2f}" for term, value in term_gpas(courses, terms, exact)]
+    lines += [
+        f"{'Total Quality Points:':<40}{quality_points:.2f}",
+        f"{'Total Credits:':<40}{credits:.0f}",
+        f"{'GPA:':<40}{gpa:.2f}",
+        "=" * 50,
+    ]
+    return _pdf(lines)
+
+RENDERERS = {'csv': render_csv, 'json': render_json, 'pdf': render_pdf}
+
+def render(fmt, student_id, courses, name=None, terms=None, exact=False):
+    """Render one transcript document in the given format.
+
+    With exact=True the GPA is rounded like GPACalculator(exact=True) does.
+    """
+    if fmt not in RENDERERS:
+        raise ValueError(f"Unknown transcript format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    return RENDERERS[fmt](student_id, courses, name, terms, exact)
+
+def transcript_filename(student_id, fmt):
+    """Safe file name for a student's transcript.
+
+    IDs that had to be changed to be safe get a short hash of the raw ID,
+    so e.g. 12/34 and 12_34 don't share a file.
+    """
+    raw_id = str(student_id)
+    safe_id = re.sub(r'[^\w.-]', '_', raw_id) or 'student'
+    if safe_id != raw_id:
+        safe_id += '-' + hashlib.sha1(raw_id.encode('utf-8')).hexdigest()[:8]
+    return f"{safe_id}.{fmt}"
+
+def _unique_filename(filename, used):
+    """filename, or filename with a counter if it's already in `used` (ignoring case)"""
+    stem, ext = os.path.splitext(filename)
+    candidate, counter = filename, 1
+    while candidate.lower() in used:
+        counter += 1
+        candidate = f"{stem}-{counter}{ext}"
+    used.add(candidate.lower())
+    return candidate
+
+def render_group(transcripts, formats, exact=False):
+    """Render a group of (student_id, name, courses, terms) into (filename, bytes) pairs"""
+    files = []
+    for student_id, name, courses, terms in transcripts:
+        # One pass over e.g. a CourseTable instead of one per format and total
+        courses = list(courses)
+        for fmt in formats:
+            files.append((transcript_filename(student_id, fmt), render(fmt, student_id, courses, name, terms, exact)))
+    return files
+
+class DirectorySink:
+    """Writes documents as files in a directory"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, filename, data):
+        with open(os.path.join(self.path, filename), 'wb') as out:
+            out.write(data)
+
+    def close(self):
+        pass
+
+class ZipSink:
+    """Writes documents into a zip archive, one compressed entry at a time"""
+
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, filename, data):
+        self.archive.writestr(filename, data)
+
+    def close(self):
+        self.archive.close()
+
+def open_sink(target):
+    """Zip sink for a .zip target, otherwise a directory sink"""
+    if str(target).lower().endswith('.zip'):
+        return ZipSink(target)
+    return DirectorySink(target)
+
+def _groups(transcripts, size):
+    group = []
+    for transcript in transcripts:
+        group.append(transcript)
+        if len(group) >= size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+def _render_parallel(groups, formats, workers, exact=False):
+    """Render groups in a process pool, yielding (students, documents) in input order"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for group in groups:
+            pending.append((len(group), pool.submit(render_group, group, formats, exact)))
+            if len(pending) >= workers * 2:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
+def export_transcripts(transcripts, target, formats=FORMATS, workers=1, group_size=200, exact=False):
+    """Render every transcript and stream the documents to a directory or .zip.
+
+    Students are rendered in groups of group_size; with workers > 1 the
+    groups go to a process pool with at most two groups per worker in
+    flight, and are written in input order as they complete. Returns
+    (students, files) written. Pass exact=True for transcripts graded
+    with GPACalculator(exact=True).
+    """
+    for fmt in formats:
+        if fmt not in RENDERERS:
+            raise ValueError(f"Unknown transcript format {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+    groups = _groups(transcripts, group_size)
+    if workers > 1:
+        results = _render_parallel(groups, formats, workers, exact)
+    else:
+        results = ((len(group), render_group(group, formats, exact)) for group in groups)
+    
+    students = files = 0
+    # Names already written, so repeated IDs (or IDs differing only in
+    # case, on case-insensitive file systems) don't overwrite each other
+    used = set()
+    sink = open_sink(target)
+    try:
+        for count, documents in results:
+            for filename, data in documents:
+                sink.write(_unique_filename(filename, used), data)
+            students += count
+            files += len(documents)
+    finally:
+        sink.close()
+    return students, files
@@ -0,0 +1,203 @@
+"""Exact fixed-point grading in integer hundredths.
+
+Marks, percentages, grade points and quality points are all carried as
+integers counting hundredths, so e.g. 32.4/60 is exactly 54.00% with no
+float rounding involved at all. Enable it with GPACalculator(exact=True);
+`python -m gpa_calculator exact-check` compares it with the float path
+over exhaustive mark grids.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+import numpy as np
+
+def to_hundredths(value):
+    """Integer hundredths of a mark (or any decimal value), rounded half up.
+
+    Floats go through their shortest repr, so 14.45 means 1445 rather than
+    whatever its binary approximation times 100 rounds to.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        # Marks with at most two decimals land within rounding error of an
+        # integer; only other values need the slower Decimal rounding
+        scaled = value * 100
+        nearest = round(scaled)
+        if abs(scaled - nearest) < 1e-6:
+            return nearest
+    return int(Decimal(str(value)).scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+def array_hundredths(values):
+    """Vectorized to_hundredths for arrays of marks with at most two decimals"""
+    return np.round(np.asarray(values, dtype=float) * 100).astype(np.int64)
+
+def gpa_hundredths(quality_hundredths, credits):
+    """GPA in hundredths, rounded half up using integer math only"""
+    if credits <= 0:
+        return 0
+    return (2 * quality_hundredths + credits) // (2 * credits)
+
+def quality_hundredths(quality_points):
+    """Total of quality point values in integer hundredths, so sums never drift"""
+    return sum(round(points * 100) for points in quality_points)
+
+def gpa(quality_hundredths, credits, exact=False):
+    """GPA from total quality points in hundredths.
+
+    With exact=True it is rounded to hundredths with integer math
+    (gpa_hundredths), so every output shows the same two decimals.
+    """
+    if exact:
+        return gpa_hundredths(quality_hundredths, credits) / 100
+    return quality_hundredths / 100 / credits if credits > 0 else 0
+
+def target_hundredths(target, credits, exact=False):
+    """Least total quality hundredths giving a GPA of at least target over credits"""
+    # GPA >= target  <=>  quality hundredths >= target hundredths * credits,
+    # less up to half a hundredth per credit when the GPA is rounded half up
+    needed = round(target * 100) * credits
+    return needed - credits // 2 if exact else needed
+
+class FixedPointGrader:
+    """Integer-only grading against a policy's compiled scale"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.scale = policy.scale
+        # The scale's dense table with grade points as integer hundredths
+        self.points = [to_hundredths(points) for points, _ in self.scale.table]
+        self.letters = [letter for _, letter in self.scale.table]
+        self.points_array = np.array(self.points, dtype=np.int64)
+        self.letters_array = np.array(self.letters, dtype=object)
+        self.max_hundredths = to_hundredths(self.scale.max_percentage)
+
+        # Total marks per credit hours, in hundredths
+        self.totals = {hours: to_hundredths(sum(split)) for hours, split in policy.mark_splits.items()}
+        self.default_total = to_hundredths(policy.default_total_marks)
+
+    def total_hundredths(self, credit_hours):
+        return self.totals.get(credit_hours, self.default_total)
+
+    def percentage_hundredths(self, obtained, total):
+        """Percentage in hundredths, truncated like the float path"""
+        if total <= 0:
+            return 0
+        return obtained * 10000 // total
+
+    def lookup(self, percentage):
+        """Get (grade points in hundredths, letter) for a percentage in hundredths"""
+        if percentage < 0 or percentage > self.max_hundredths:
+            return self.points[0], self.letters[0]
+        index = percentage * self.scale.resolution // 100
+        return self.points[index], self.letters[index]
+
+    def grade_marks(self, credit_hours, mids, final, sectional):
+        """Grade marks given in hundredths.
+
+        Returns (percentage, grade points, letter, quality points, obtained,
+        total), every number in integer hundredths.
+        """
+        total = self.total_hundredths(credit_hours)
+        obtained = mids + final + sectional
+        percentage = self.percentage_hundredths(obtained, total)
+        points, letter = self.lookup(percentage)
+        return percentage, points, letter, points * credit_hours, obtained, total
+
+    def grade_arrays(self, credits, mids, final, sectional):
+        """Vectorized grade_marks over int64 arrays of marks in hundredths.
+
+        Returns (percentage, grade points, letters, quality points) arrays,
+        the numbers as int64 hundredths.
+        """
+        credits = np.asarray(credits, dtype=np.int64)
+        total = np.full(len(credits), self.default_total, dtype=np.int64)
+        for hours, hundredths in self.totals.items():
+            total[credits == hours] = hundredths
+
+        obtained = np.asarray(mids, dtype=np.int64) + np.asarray(final, dtype=np.int64) + np.asarray(sectional, dtype=np.int64)
+        percentage = np.where(total > 0, obtained * 10000 // np.maximum(total, 1), 0)
+
+        in_range = (percentage >= 0) & (percentage <= self.max_hundredths)
+        index = np.where(in_range, percentage * self.scale.resolution // 100, 0)
+        points = self.points_array[index]
+        return percentage, points, self.letters_array[index], points * credits
+
+def _grids(policy, step_hundredths):
+    """(credit hours, total, mids, final, sectional) mark grids in hundredths for validate"""
+    for credit_hours, split in sorted(policy.mark_splits.items()):
+        total = to_hundredths(sum(split))
+        axes = [np.arange(0, to_hundredths(limit) + 1, step_hundredths) for limit in split]
+        mids, final, sectional = (axis.ravel() for axis in np.meshgrid(*axes, indexing='ij'))
+        # Every 0.01 of obtained marks, all scored as mids
+        extra = np.arange(total + 1, dtype=np.int64)
+        yield (
+            credit_hours, total,
+            np.concatenate([mids, extra]),
+            np.concatenate([final, np.zeros_like(extra)]),
+            np.concatenate([sectional, np.zeros_like(extra)]),
+        )
+
+    # Credit hours without a split are graded out of default_total_marks;
+    # check those between and just past the split ones (1 and 4 for GCUF)
+    total = to_hundredths(policy.default_total_marks)
+    obtained = np.arange(total + 1, dtype=np.int64)
+    for credit_hours in range(1, max(policy.mark_splits, default=0) + 2):
+        if credit_hours in policy.mark_splits:
+            continue
+        # Every 0.01 of obtained marks, scored as mids and again spread over
+        # all three components so the float sum gets exercised too
+        third = obtained // 3
+        yield (
+            credit_hours, total,
+            np.concatenate([obtained, third]),
+            np.concatenate([np.zeros_like(obtained), third]),
+            np.concatenate([np.zeros_like(obtained), obtained - 2 * third]),
+        )
+
+def validate(policy, step=0.5):
+    """Compare fixed-point and float grading over exhaustive mark grids.
+
+    For every credit-hour split, every (mids, final, sectional) combination
+    in `step` increments is graded, plus every 0.01 of obtained marks out
+    of the total; credit hours without a split are checked at every 0.01
+    of default_total_marks. Returns (grid size, fixed errors, float
+    differences): fixed errors are (credits, obtained, percentage, exact
+    percentage) where the fixed-point percentage differs from exact
+    rational arithmetic (there should be none); float differences are
+    (credits, mids, final, sectional, float points, fixed points) where the
+    float path lands in another band.
+    """
+    from gpa_calculator.grading import GPACalculator
+
+    calculator = GPACalculator(policy)
+    grader = FixedPointGrader(policy)
+    size = 0
+    fixed_errors = []
+    float_differences = []
+
+    for credit_hours, total, mids, final, sectional in _grids(policy, to_hundredths(step)):
+        credits = np.full(len(mids), credit_hours)
+        size += len(mids)
+
+        percentage, points, _, _ = grader.grade_arrays(credits, mids, final, sectional)
+
+        # Exact rational reference for each distinct obtained total
+        obtained = mids + final + sectional
+        values, inverse = np.unique(obtained, return_inverse=True)
+        exact = np.array([int(Fraction(int(value) * 10000, total)) for value in values])[inverse]
+        for i in np.flatnonzero(percentage != exact):
+            fixed_errors.append((credit_hours, int(obtained[i]) / 100, int(percentage[i]), int(exact[i])))
+
+        graded = calculator.grade_frame({
+            'credits': credits, 'mids': mids / 100, 'final': final / 100, 'sectional': sectional / 100
+        })
+        float_points = array_hundredths(graded['grade_value'])
+        for i in np.flatnonzero(float_points != points):
+            float_differences.append((
+                credit_hours, int(mids[i]) / 100, int(final[i]) / 100, int(sectional[i]) / 100,
+                int(float_points[i]) / 100, int(points[i]) / 100
+            ))
+
+    return size, fixed_errors, float_differences
@@ -0,0 +1,201 @@
+import numpy as np
+from dataclasses import dataclass
+from gpa_calculator.scales import get_policy
+from gpa_calculator.fixed import FixedPointGrader, array_hundredths, to_hundredths
+from gpa_calculator.instrumentation import timed
+
+@dataclass
+class Course:
+    name: str
+    credit_hours: int
+    grade_value: float
+    grade_letter: str
+    quality_points: float
+    input_method: str
+    percentage: float = 0.0
+    marks_details: dict = None
+
+class GPACalculator:
+    def __init__(self, policy='gcuf', exact=False):
+        # Grading scale and mark splits come from the scale registry
+        # (GCUF by default, see data/gcuf.json); a policy name or a
+        # GradingPolicy can be passed to grade with another scale
+        if isinstance(policy, str):
+            policy = get_policy(policy)
+        self.policy = policy
+        
+        # With exact=True marks are graded in integer hundredths
+        # (see gpa_calculator.fixed) instead of float percentages
+        self.exact = exact
+        self.fixed = FixedPointGrader(policy) if exact else None
+        
+        self.grading_scale = policy.bands
+        
+        # Letter grade mapping for display
+        self.grade_to_letter = policy.grade_to_letter
+        
+        # Direct letter grade selection
+        self.letter_to_points = policy.letter_to_points
+        
+        # Map letter grades to approximate percentages (for display)
+        self.letter_to_percentage = policy.letter_to_percentage
+        
+        # Compiled once per policy so per-course lookups don't scan the bands
+        self.scale = policy.scale
+
+    def get_grade_from_percentage(self, percentage):
+        """Get grade points from percentage using the grading scale"""
+        return self.scale.lookup(percentage)[0]
+
+    @timed('grading.calculate_from_grade')
+    def calculate_from_grade(self, name, credit_hours, grade_letter):
+        """Calculate from direct grade selection"""
+        # Get grade points based on letter
+        grade_value = self.letter_to_points.get(grade_letter, 0.00)
+            
+        quality_points = grade_value * credit_hours
+        
+        return Course(
+            name=name,
+            credit_hours=credit_hours,
+            grade_value=grade_value,
+            grade_letter=grade_letter,
+            quality_points=quality_points,
+            input_method='grade',
+            percentage=self.letter_to_percentage.get(grade_letter, 0)
+        )
+
+    def get_mark_split(self, credit_hours):
+        """Get (max_mids, max_final, max_sectional, total_marks) for credit hours"""
+        return self.policy.mark_split(credit_hours)
+
+    def marks_percentage(self, credit_hours, mids, final, sectional):
+        """Percentage for marks without looking up the grade, in exact mode too"""
+        if self.exact:
+            obtained = to_hundredths(mids) + to_hundredths(final) + to_hundredths(sectional)
+            return self.fixed.percentage_hundredths(obtained, self.fixed.total_hundredths(credit_hours)) / 100
+        total_marks = self.get_mark_split(credit_hours)[3]
+        obtained_marks = mids + final + sectional
+        return (obtained_marks / total_marks) * 100 if total_marks > 0 else 0
+
+    def grade_marks(self, credit_hours, mids, final, sectional):
+        """Get (percentage, grade points, letter) for marks, in exact mode too"""
+        if self.exact:
+            percentage, grade_value, grade_letter, _, _, _ = self.fixed.grade_marks(
+                credit_hours, to_hundredths(mids), to_hundredths(final), to_hundredths(sectional)
+            )
+            return percentage / 100, grade_value / 100, grade_letter
+        percentage = self.marks_percentage(credit_hours, mids, final, sectional)
+        return (percentage,) + self.scale.lookup(percentage)
+
+    @timed('grading.calculate_from_marks')
+    def calculate_from_marks(self, name, credit_hours, mids, final, sectional):
+        """Calculate from marks based on credit hours"""
+        
+        # Set max marks based on credit hours
+        max_mids, max_final, max_sectional, total_marks = self.get_mark_split(credit_hours)
+        
+        if self.exact:
+            # Same steps in integer hundredths, converted back for display
+            percentage, grade_value, grade_letter, quality_points, obtained_marks, _ = self.fixed.grade_marks(
+                credit_hours, to_hundredths(mids), to_hundredths(final), to_hundredths(sectional)
+            )
+            percentage /= 100
+            grade_value /= 100
+            quality_points /= 100
+            obtained_marks /= 100
+        else:
+            # Calculate percentage
+            obtained_marks = mids + final + sectional
+            percentage = (obtained_marks / total_marks) * 100 if total_marks > 0 else 0
+            
+            # Get grade points and letter grade from percentage
+            grade_value, grade_letter = self.scale.lookup(percentage)
+            
+            quality_points = grade_value * credit_hours
+        
+        # Store marks details
+        marks_details = {
+            'mids': mids,
+            'final': final,
+            'sectional': sectional,
+            'total_marks': total_marks,
+            'obtained': obtained_marks,
+            'max_mids': max_mids,
+            'max_final': max_final,
+            'max_sectional': max_sectional
+        }
+        
+        return Course(
+            name=name,
+            credit_hours=credit_hours,
+            grade_value=grade_value,
+            grade_letter=grade_letter,
+            quality_points=quality_points,
+            input_method='marks',
+            percentage=percentage,
+            marks_details=marks_details
+        )
+
+    @timed('grading.grade_frame')
+    def grade_frame(self, frame):
+        """Grade a whole cohort at once from a DataFrame (or dict of arrays).
+        
+        Expects a 'credits' column plus 'mids', 'final', 'sectional' marks
+        and/or a 'grade' letter column. Rows with a grade letter are graded
+        like calculate_from_grade, the rest like calculate_from_marks. Returns
+        a copy with percentage, grade_value, grade_letter and quality_points
+        columns added.
+        """
+        # Imported here so the app doesn't pay for pandas until it's needed
+        import pandas as pd
+        
+        frame = pd.DataFrame(frame)
+        n = len(frame)
+        zeros = np.zeros(n)
+        
+        def column(name):
+            if name in frame:
+                return pd.to_numeric(frame[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+            return zeros
+        
+        credits = column('credits')
+        
+        if self.exact:
+            # Integer hundredths throughout, see gpa_calculator.fixed
+            percentage, grade_value, grade_letter, _ = self.fixed.grade_arrays(
+                credits.astype(np.int64),
+                array_hundredths(column('mids')),
+                array_hundredths(column('final')),
+                array_hundredths(column('sectional'))
+            )
+            percentage = percentage / 100
+            grade_value = grade_value / 100
+        else:
+            # Set total marks based on credit hours
+            total_marks = np.full(n, float(self.policy.default_total_marks))
+            for hours, split in self.policy.mark_splits.items():
+                total_marks[credits == hours] = sum(split)
+            
+            # Calculate percentage and look up grade points and letter
+            obtained = column('mids') + column('final') + column('sectional')
+            percentage = obtained / total_marks * 100
+            grade_value, grade_letter = self.scale.lookup_array(percentage)
+        
+        # Rows with a letter grade override the marks-based result
+        if 'grade' in frame:
+            grades = frame['grade']
+            by_grade = grades.notna().to_numpy()
+            grade_value = np.where(by_grade, grades.map(self.letter_to_points).fillna(0.00).to_numpy(dtype=float), grade_value)
+            grade_letter = np.where(by_grade, grades.to_numpy(dtype=object), grade_letter)
+            percentage = np.where(by_grade, grades.map(self.letter_to_percentage).fillna(0).to_numpy(dtype=float), percentage)
+        
+        result = frame.copy()
+        result['percentage'] = percentage
+        result['grade_value'] = grade_value
+        result['grade_letter'] = grade_letter
+        if self.exact:
+            result['quality_points'] = array_hundredths(grade_value) * credits.astype(np.int64) / 100
+        else:
+            result['quality_points'] = grade_value * credits
+        return result
@@ -0,0 +1,116 @@
+import os
+
+# Accepted spellings of each column, after lower-casing and trimming
+COLUMN_ALIASES = {
+    'name': ('name', 'course', 'course name', 'course_name', 'title'),
+    'credits': ('credits', 'credit hours', 'credit_hours', 'credit'),
+    'grade': ('grade', 'letter', 'letter grade'),
+    'mids': ('mids', 'mid', 'midterm'),
+    'final': ('final', 'finals'),
+    'sectional': ('sectional', 'sessional'),
+    'obtained': ('obtained', 'total', 'marks', 'total marks'),
+}
+
+MARK_FIELDS = ['mids', 'final', 'sectional', 'obtained']
+
+# Credit hours the app's course editors can hold
+CREDIT_OPTIONS = [1, 2, 3, 4]
+
+def read_course_file(file, filename=None):
+    """Read a course list from a CSV or Excel file (path or file object)"""
+    import pandas as pd
+    
+    filename = filename or getattr(file, 'name', None) or str(file)
+    if os.path.splitext(filename)[1].lower() in ('.xlsx', '.xls'):
+        try:
+            return pd.read_excel(file)
+        except ImportError:
+            raise RuntimeError("Reading Excel files requires openpyxl (pip install openpyxl)")
+    return pd.read_csv(file)
+
+def parse_course_frame(frame, calculator):
+    """Validate a course list and turn it into course_inputs entries.
+    
+    Rows with a grade letter become grade-based courses, the rest
+    marks-based. Marks are checked in one vectorized pass against the
+    maxima from calculator.get_mark_split for each row's credit hours.
+    Returns (courses, errors); rows with errors are left out.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    # Normalize column names
+    renames = {}
+    for column in frame.columns:
+        label = str(column).strip().lower()
+        for field, aliases in COLUMN_ALIASES.items():
+            if label in aliases:
+                renames[column] = field
+    frame = frame.rename(columns=renames)
+    if 'credits' not in frame:
+        return [], ["Missing a 'credits' (credit hours) column"]
+    
+    n = len(frame)
+    errors = {}
+    def fail(mask, message):
+        for row in np.flatnonzero(mask):
+            # Spreadsheet row numbers: header is row 1
+            errors.setdefault(row, []).append(message(row))
+    
+    names = [str(name).strip() if pd.notna(name) else '' for name in frame['name']] if 'name' in frame else [''] * n
+    credits = pd.to_numeric(frame['credits'], errors='coerce').to_numpy(dtype=float)
+    bad_credits = ~np.isin(credits, CREDIT_OPTIONS)
+    fail(bad_credits, lambda row: f"credit hours must be one of {', '.join(map(str, CREDIT_OPTIONS))}, "
+                                  f"got {frame['credits'].iloc[row]!r}")
+    
+    raw_grades = frame['grade'] if 'grade' in frame else [None] * n
+    grades = pd.Series(
+        [str(grade).strip().upper() if pd.notna(grade) and str(grade).strip() else None for grade in raw_grades],
+        dtype=object
+    )
+    by_grade = grades.notna().to_numpy()
+    bad_grade = by_grade & ~grades.isin(list(calculator.letter_to_points)).to_numpy()
+    fail(bad_grade, lambda row: f"unknown grade {grades.iloc[row]!r}")
+    
+    # Per-row maxima from the mark split for each row's credit hours
+    limits = {field: np.zeros(n) for field in MARK_FIELDS}
+    has_split = np.zeros(n, dtype=bool)
+    for hours in np.unique(credits[~bad_credits]):
+        rows = credits == hours
+        max_mids, max_final, max_sectional, total_marks = calculator.get_mark_split(int(hours))
+        limits['mids'][rows] = max_mids
+        limits['final'][rows] = max_final
+        limits['sectional'][rows] = max_sectional
+        limits['obtained'][rows] = total_marks
+        has_split[rows] = max_mids + max_final + max_sectional > 0
+    
+    marks = {}
+    for field in MARK_FIELDS:
+        raw = frame[field] if field in frame else pd.Series(np.nan, index=frame.index)
+        values = pd.to_numeric(raw, errors='coerce')
+        marks[field] = values.fillna(0.0).to_numpy(dtype=float)
+        
+        # Only the fields used for the row's credit hours are checked
+        used = ~by_grade & ~bad_credits & (has_split if field != 'obtained' else ~has_split)
+        fail(used & (raw.notna() & values.isna()).to_numpy(), lambda row, field=field: f"{field} is not a number")
+        fail(used & (marks[field] < 0), lambda row, field=field: f"{field} can't be negative")
+        fail(used & (marks[field] > limits[field]),
+             lambda row, field=field: f"{field} {marks[field][row]:g} is above the maximum of "
+                                      f"{limits[field][row]:g} for {credits[row]:g} credit hours")
+    
+    courses = []
+    for row in range(n):
+        if row in errors:
+            continue
+        course = {"name": names[row], "credits": int(credits[row])}
+        if by_grade[row]:
+            course.update({"grade": grades.iloc[row], "method": "grade"})
+        elif has_split[row]:
+            course.update({"mids": float(marks['mids'][row]), "final": float(marks['final'][row]),
+                           "sectional": float(marks['sectional'][row]), "method": "marks"})
+        else:
+            course.update({"obtained": float(marks['obtained'][row]), "method": "marks"})
+        courses.append(course)
+    
+    messages = [f"Row {row + 2}: {'; '.join(problems)}" for row, problems in sorted(errors.items())]
+    return courses, messages
@@ -0,0 +1,144 @@
+"""Lightweight timers and counters for the grading and rendering hot paths.
+
+Disabled unless GPA_INSTRUMENT is set (to anything but 0/false/empty) when
+the package is imported. While disabled, timed() hands back the function
+unchanged and span() returns a shared no-op context manager, so the
+instrumented code runs as if the hooks weren't there.
+
+    GPA_INSTRUMENT=1         collect timers and counters
+    GPA_METRICS_LOG=path     append a JSON snapshot per flush() (one per rerun)
+    GPA_PROFILE=cprofile     profile every rerun (or "pyinstrument")
+    GPA_PROFILE_DIR=dir      where per-rerun profiles are written (default "profiles")
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+def _flag(name):
+    return os.environ.get(name, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+ENABLED = _flag('GPA_INSTRUMENT')
+METRICS_LOG = os.environ.get('GPA_METRICS_LOG') or None
+PROFILER = (os.environ.get('GPA_PROFILE') or '').strip().lower() or None
+PROFILE_DIR = os.environ.get('GPA_PROFILE_DIR') or 'profiles'
+
+_lock = threading.Lock()
+# name -> [calls, total seconds, max seconds]
+_timers = {}
+# name -> count
+_counters = {}
+_noop = nullcontext()
+
+def record(name, seconds):
+    """Add one timed call to the named timer"""
+    with _lock:
+        timer = _timers.get(name)
+        if timer is None:
+            _timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+def count(name, n=1):
+    """Increment the named counter (no-op while disabled)"""
+    if ENABLED:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+@contextmanager
+def _span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+def span(name):
+    """Context manager timing the enclosed block under name"""
+    return _span(name) if ENABLED else _noop
+
+def timed(name):
+    """Decorator timing every call of a function under name.
+
+    Applied at import time, so while disabled the function is returned
+    as is and costs nothing extra per call.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def snapshot():
+    """Current timers and counters as a JSON-serializable dict"""
+    with _lock:
+        timers = {
+            name: {
+                'calls': calls,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total / calls * 1000, 3),
+                'max_ms': round(longest * 1000, 3),
+            }
+            for name, (calls, total, longest) in sorted(_timers.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {'enabled': ENABLED, 'timers': timers, 'counters': counters}
+
+def reset():
+    """Clear all timers and counters"""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+def flush():
+    """Append a timestamped snapshot to GPA_METRICS_LOG, if one is configured"""
+    if not (ENABLED and METRICS_LOG):
+        return
+    line = json.dumps({'time': time.time(), **snapshot()})
+    with _lock, open(METRICS_LOG, 'a') as log:
+        log.write(line + '\n')
+
+@contextmanager
+def _profile(label):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{time.perf_counter_ns()}")
+    if PROFILER == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("GPA_PROFILE=pyinstrument requires pyinstrument (pip install pyinstrument)")
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path + '.html', 'w') as out:
+                out.write(profiler.output_html())
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            # Open with python -m pstats or snakeviz
+            profiler.dump_stats(path + '.prof')
+
+def profile(label='rerun'):
+    """Context manager capturing a cProfile/pyinstrument profile of the block when GPA_PROFILE is set"""
+    return _profile(label) if PROFILER else _noop
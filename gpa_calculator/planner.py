@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from gpa_calculator.fixed import quality_hundredths, target_hundredths
+
+@dataclass
+class PendingCourse:
+    name: str
+    credit_hours: int
+    mids: float
+    # None when the sectional is still pending too
+    sectional: float = None
+
+def _options(calculator, course, step):
+    """Cheapest (cost in steps, quality hundredths, final, sectional) per reachable grade"""
+    max_mids, max_final, max_sectional, total_marks = calculator.get_mark_split(course.credit_hours)
+    if max_final == 0:
+        raise ValueError(f"{course.name}: no mark split for {course.credit_hours} credit hours")
+    
+    pending_sectional = course.sectional is None
+    remaining = max_final + (max_sectional if pending_sectional else 0)
+    
+    options = []
+    last_points = None
+    for cost in range(int(remaining / step) + 1):
+        extra = cost * step
+        # Fill the final first, then the sectional
+        final = min(extra, max_final)
+        sectional = extra - final if pending_sectional else course.sectional
+        
+        # Same grading as calculate_from_marks, exact mode included
+        points = calculator.grade_marks(course.credit_hours, course.mids, final, sectional)[1]
+        if points != last_points:
+            options.append((cost, round(points * course.credit_hours * 100), final, sectional))
+            last_points = points
+    return options
+
+def solve_target_gpa(calculator, target, pending, completed=(), step=0.5):
+    """Minimum final (and pending sectional) marks to reach a target GPA.
+    
+    `pending` is a list of PendingCourse with mids already recorded and
+    `completed` the already graded Course objects counted in the GPA (pass
+    the whole history for a CGPA target). Each pending course only has a
+    few distinct grade bands reachable in `step` mark increments, so a
+    knapsack DP over total marks finds the cheapest combination of bands
+    whose GPA is at least `target`. Returns the pending courses graded at
+    those marks, or None if the target can't be reached.
+    """
+    quality = quality_hundredths(course.quality_points for course in completed)
+    credits = sum(course.credit_hours for course in completed)
+    credits += sum(course.credit_hours for course in pending)
+    
+    needed = target_hundredths(target, credits, calculator.exact) - quality
+    
+    # best[c] = highest quality reachable spending exactly c steps, or -1
+    best = [0]
+    choices = []
+    for course in pending:
+        options = _options(calculator, course, step)
+        size = len(best) + options[-1][0]
+        new_best = [-1] * size
+        choice = [None] * size
+        for spent, value in enumerate(best):
+            if value < 0:
+                continue
+            for index, (cost, gained, _, _) in enumerate(options):
+                if value + gained > new_best[spent + cost]:
+                    new_best[spent + cost] = value + gained
+                    choice[spent + cost] = (spent, index)
+        best = new_best
+        choices.append((course, options, choice))
+    
+    total = next((cost for cost, value in enumerate(best) if value >= needed), None)
+    if total is None:
+        return None
+    
+    # Walk the choices back to per-course marks
+    planned = []
+    for course, options, choice in reversed(choices):
+        spent, index = choice[total]
+        _, _, final, sectional = options[index]
+        planned.append(calculator.calculate_from_marks(course.name, course.credit_hours, course.mids, final, sectional))
+        total = spent
+    planned.reverse()
+    return planned
@@ -0,0 +1,163 @@
+from array import array
+from gpa_calculator.grading import GPACalculator
+
+# Input methods as stored in CourseTable.methods
+METHODS = ('marks', 'grade')
+
+class CourseRecord:
+    """Slotted, read-only stand-in for Course.
+    
+    Only the inputs and the looked-up grade are stored; quality_points,
+    percentage and marks_details are derived on access.
+    """
+    __slots__ = (
+        'name', 'credit_hours', 'grade_value', 'grade_letter',
+        'input_method', 'mids', 'final', 'sectional', 'calculator'
+    )
+
+    def __init__(self, name, credit_hours, grade_value, grade_letter, input_method,
+                 mids=0.0, final=0.0, sectional=0.0, calculator=None):
+        self.name = name
+        self.credit_hours = credit_hours
+        self.grade_value = grade_value
+        self.grade_letter = grade_letter
+        self.input_method = input_method
+        self.mids = mids
+        self.final = final
+        self.sectional = sectional
+        self.calculator = calculator
+
+    @property
+    def quality_points(self):
+        return self.grade_value * self.credit_hours
+
+    @property
+    def percentage(self):
+        if self.input_method == 'grade':
+            return self.calculator.letter_to_percentage.get(self.grade_letter, 0)
+        return self.calculator.marks_percentage(self.credit_hours, self.mids, self.final, self.sectional)
+
+    @property
+    def marks_details(self):
+        if self.input_method == 'grade':
+            return None
+        max_mids, max_final, max_sectional, total_marks = self.calculator.get_mark_split(self.credit_hours)
+        return {
+            'mids': self.mids,
+            'final': self.final,
+            'sectional': self.sectional,
+            'total_marks': total_marks,
+            'obtained': self.mids + self.final + self.sectional,
+            'max_mids': max_mids,
+            'max_final': max_final,
+            'max_sectional': max_sectional
+        }
+
+    def __repr__(self):
+        return (f"CourseRecord(name={self.name!r}, credit_hours={self.credit_hours}, "
+                f"grade_value={self.grade_value}, grade_letter={self.grade_letter!r}, "
+                f"input_method={self.input_method!r})")
+
+class CourseTable:
+    """Struct-of-arrays storage for large numbers of graded courses.
+    
+    Each row costs a fixed ~39 bytes in typed arrays; course names and
+    letters are interned. Iterating or indexing yields CourseRecord views,
+    so a table can be used wherever a list of Course objects is expected.
+    """
+
+    def __init__(self, calculator=None):
+        self.calculator = calculator or GPACalculator()
+        self.names = []
+        self.name_index = {}
+        self.letters = []
+        self.letter_index = {}
+        
+        self.name_ids = array('I')
+        self.credit_hours = array('B')
+        self.grade_values = array('d')
+        self.letter_ids = array('B')
+        self.methods = array('B')
+        self.mids = array('d')
+        self.finals = array('d')
+        self.sectionals = array('d')
+
+    def _intern(self, values, index, value):
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    def _append_row(self, name, credit_hours, grade_value, grade_letter, method, mids, final, sectional):
+        self.name_ids.append(self._intern(self.names, self.name_index, name))
+        self.credit_hours.append(credit_hours)
+        self.grade_values.append(grade_value)
+        self.letter_ids.append(self._intern(self.letters, self.letter_index, grade_letter))
+        self.methods.append(METHODS.index(method))
+        self.mids.append(mids)
+        self.finals.append(final)
+        self.sectionals.append(sectional)
+
+    def add_marks(self, name, credit_hours, mids, final, sectional):
+        """Grade from marks straight into the table, without building a Course"""
+        _, grade_value, grade_letter = self.calculator.grade_marks(credit_hours, mids, final, sectional)
+        self._append_row(name, credit_hours, grade_value, grade_letter, 'marks', mids, final, sectional)
+
+    def add_grade(self, name, credit_hours, grade_letter):
+        """Grade from a letter straight into the table, without building a Course"""
+        grade_value = self.calculator.letter_to_points.get(grade_letter, 0.00)
+        self._append_row(name, credit_hours, grade_value, grade_letter, 'grade', 0.0, 0.0, 0.0)
+
+    def add_graded(self, name, credit_hours, grade_value, grade_letter, method, mids=0.0, final=0.0, sectional=0.0):
+        """Add a row graded elsewhere (e.g. read back from storage) without regrading it"""
+        self._append_row(name, credit_hours, grade_value, grade_letter, method, mids, final, sectional)
+
+    def append(self, course):
+        """Add an already graded Course (or CourseRecord)"""
+        details = course.marks_details or {}
+        self._append_row(
+            course.name, course.credit_hours, course.grade_value, course.grade_letter,
+            course.input_method, details.get('mids', 0.0), details.get('final', 0.0),
+            details.get('sectional', 0.0)
+        )
+
+    def extend(self, courses):
+        for course in courses:
+            self.append(course)
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return CourseRecord(
+            self.names[self.name_ids[i]],
+            self.credit_hours[i],
+            self.grade_values[i],
+            self.letters[self.letter_ids[i]],
+            METHODS[self.methods[i]],
+            self.mids[i],
+            self.finals[i],
+            self.sectionals[i],
+            self.calculator
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def total_quality_points(self):
+        return sum(value * credits for value, credits in zip(self.grade_values, self.credit_hours))
+
+    def total_credits(self):
+        return sum(self.credit_hours)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the per-row arrays (excluding interned names)"""
+        columns = (
+            self.name_ids, self.credit_hours, self.grade_values, self.letter_ids,
+            self.methods, self.mids, self.finals, self.sectionals
+        )
+        return sum(column.itemsize * len(column) for column in columns)
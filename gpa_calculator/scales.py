@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+import numpy as np
+
+# Float drift tolerated when scaling a percentage to table slots, so that
+# e.g. 32.4/60*100 = 53.999...% still lands on 54.00% instead of 53.99%
+DRIFT = 1e-6
+
+class GradingScale:
+    """Precompiled grading scale with O(1) percentage lookups"""
+
+    def __init__(self, bands, grade_to_letter, resolution=100):
+        # Bands sorted from lowest to highest percentage
+        self.bands = sorted(bands)
+        self.resolution = resolution
+        self.max_percentage = max(high for _, high, _ in self.bands)
+        
+        # Letter thresholds from highest to lowest grade points
+        self.letter_thresholds = sorted(grade_to_letter.items(), reverse=True)
+        
+        # Dense table indexed by percentage in hundredths, each slot holding
+        # (grade points, letter). A band runs up to the next band's lower
+        # bound, so values like 84.995 no longer fall between (84, 84.99)
+        # and (85, 100).
+        size = round(self.max_percentage * resolution) + 1
+        self.max_index = size - 1
+        self.table = [(0.00, self.letter_for(0.00))] * size
+        for i, (low, high, points) in enumerate(self.bands):
+            start = round(low * resolution)
+            if i + 1 < len(self.bands):
+                end = round(self.bands[i + 1][0] * resolution)
+            else:
+                end = size
+            entry = (points, self.letter_for(points))
+            self.table[start:end] = [entry] * (end - start)
+        
+        # Band starts (in hundredths) for vectorized np.searchsorted lookups
+        self.starts = np.array([round(low * resolution) for low, _, _ in self.bands])
+        self.points = np.array([points for _, _, points in self.bands])
+        self.letters = np.array([self.letter_for(points) for _, _, points in self.bands], dtype=object)
+        
+        # Letters by grade points, so letters follow from the points alone
+        self.point_values = np.unique(np.append(self.points, 0.00))
+        self.point_letters = np.array([self.letter_for(points) for points in self.point_values], dtype=object)
+        # Whether gpa_calculator.native can grade for this scale, checked on first use
+        self._uses_native = None
+
+    def letter_for(self, points):
+        """Get letter grade for grade points"""
+        for threshold, letter in self.letter_thresholds:
+            if points >= threshold:
+                return letter
+        return 'F'
+
+    def lookup(self, percentage):
+        """Get (grade points, letter) for a percentage in one step"""
+        scaled = percentage * self.resolution
+        if not (percentage >= 0 and scaled <= self.max_index + DRIFT):
+            return self.table[0]
+        return self.table[int(scaled + DRIFT)]
+
+    @property
+    def uses_native(self):
+        """Whether the compiled kernel is built and grades exactly like this scale"""
+        if self._uses_native is None:
+            from gpa_calculator import native
+            self._uses_native = native.supports(self)
+        return self._uses_native
+
+    def lookup_points(self, percentages, native=True):
+        """Get a grade points array for an array of percentages, without letters"""
+        if native and self.uses_native:
+            from gpa_calculator.native import grade_arrays
+            return grade_arrays(percentages, max_percentage=self.max_percentage)[0]
+        
+        percentages = np.asarray(percentages, dtype=float)
+        scaled = percentages * self.resolution
+        in_range = (percentages >= 0) & (scaled <= self.max_index + DRIFT)
+        
+        # Same drift-tolerant truncation as lookup() so both paths agree exactly
+        hundredths = np.floor(np.where(in_range, scaled, 0) + DRIFT)
+        index = np.searchsorted(self.starts, hundredths, side='right') - 1
+        below = index < 0
+        index = np.clip(index, 0, len(self.bands) - 1)
+        
+        default_points = self.table[0][0]
+        return np.where(in_range & ~below, self.points[index], default_points)
+
+    def lookup_array(self, percentages, native=True):
+        """Get (grade points, letters) arrays for an array of percentages"""
+        points = self.lookup_points(percentages, native)
+        return points, self.point_letters[np.searchsorted(self.point_values, points)]
+
+class GradingPolicy:
+    """A validated grading scale and mark-split policy, compiled once"""
+
+    def __init__(self, definition):
+        self.name = definition['name']
+        self.title = definition.get('title', self.name)
+        self.bands = [tuple(band) for band in definition['bands']]
+        self.grade_to_letter = {points: letter for points, letter in definition['grade_to_letter']}
+        
+        letter_grades = definition.get('letter_grades', {})
+        self.letter_to_points = {letter: grade['points'] for letter, grade in letter_grades.items()}
+        self.letter_to_percentage = {letter: grade['percentage'] for letter, grade in letter_grades.items()}
+        
+        # credit hours -> (max_mids, max_final, max_sectional)
+        self.mark_splits = {
+            int(hours): (split['mids'], split['final'], split['sectional'])
+            for hours, split in definition.get('mark_splits', {}).items()
+        }
+        self.default_total_marks = definition.get('default_total_marks', 100)
+        self.resolution = definition.get('resolution', 100)
+        
+        self.scale = GradingScale(self.bands, self.grade_to_letter, self.resolution)
+
+    def mark_split(self, credit_hours):
+        """Get (max_mids, max_final, max_sectional, total_marks) for credit hours"""
+        split = self.mark_splits.get(credit_hours)
+        if split is None:
+            # Default for other credit hours
+            return 0, 0, 0, self.default_total_marks
+        return split + (sum(split),)
+
+def validate_definition(definition):
+    """Raise ValueError if a scale definition has gaps, overlaps or bad values"""
+    name = definition.get('name')
+    if not name:
+        raise ValueError("Grading scale needs a name")
+    
+    bands = sorted(tuple(band) for band in definition.get('bands', []))
+    if not bands:
+        raise ValueError(f"{name}: no grading bands")
+    
+    # Bands are inclusive, so neighbours may be one resolution step apart
+    step = 1 / definition.get('resolution', 100)
+    if bands[0][0] != 0:
+        raise ValueError(f"{name}: bands start at {bands[0][0]}%, not 0%")
+    for low, high, points in bands:
+        if low > high:
+            raise ValueError(f"{name}: band ({low}, {high}) is empty")
+        if points < 0:
+            raise ValueError(f"{name}: band ({low}, {high}) has negative grade points")
+    for (low, high, _), (next_low, next_high, _) in zip(bands, bands[1:]):
+        if next_low <= high:
+            raise ValueError(f"{name}: bands ({low}, {high}) and ({next_low}, {next_high}) overlap")
+        if next_low - high > step + 1e-9:
+            raise ValueError(f"{name}: gap between {high}% and {next_low}%")
+    
+    if not definition.get('grade_to_letter'):
+        raise ValueError(f"{name}: no letter grades")
+    
+    for hours, split in definition.get('mark_splits', {}).items():
+        marks = [split.get(part, -1) for part in ('mids', 'final', 'sectional')]
+        if min(marks) < 0 or sum(marks) <= 0:
+            raise ValueError(f"{name}: bad mark split for {hours} credit hours: {split}")
+    if definition.get('default_total_marks', 100) <= 0:
+        raise ValueError(f"{name}: default_total_marks must be positive")
+
+# Built-in scales shipped with the package
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+class ScaleRegistry:
+    """Grading scales by name, loaded from JSON/YAML and compiled on first use.
+    
+    Built-in scales are loaded from the package data directory, plus any
+    files or directories listed in the GPA_SCALE_PATH environment variable.
+    """
+
+    def __init__(self, paths=()):
+        self.definitions = {}
+        self.policies = {}
+        self.lock = threading.Lock()
+        for path in paths:
+            self.load(path)
+
+    def register(self, definition):
+        """Validate and add a scale definition, replacing any with the same name"""
+        validate_definition(definition)
+        with self.lock:
+            self.definitions[definition['name']] = definition
+            self.policies.pop(definition['name'], None)
+        return definition['name']
+
+    def load(self, path):
+        """Register scale definitions from a JSON/YAML file or a directory of them"""
+        if os.path.isdir(path):
+            return [self.load(os.path.join(path, entry))
+                    for entry in sorted(os.listdir(path))
+                    if entry.endswith(('.json', '.yaml', '.yml'))]
+        
+        with open(path) as f:
+            if path.endswith(('.yaml', '.yml')):
+                try:
+                    import yaml
+                except ImportError:
+                    raise RuntimeError("Loading YAML scales requires PyYAML (pip install pyyaml)")
+                definition = yaml.safe_load(f)
+            else:
+                definition = json.load(f)
+        return self.register(definition)
+
+    def names(self):
+        return sorted(self.definitions)
+
+    def get(self, name):
+        """Compiled GradingPolicy for a scale name"""
+        with self.lock:
+            policy = self.policies.get(name)
+            if policy is None:
+                if name not in self.definitions:
+                    raise KeyError(f"Unknown grading scale: {name!r} (available: {', '.join(sorted(self.definitions))})")
+                policy = self.policies[name] = GradingPolicy(self.definitions[name])
+            return policy
+
+def _default_paths():
+    paths = [DATA_DIR]
+    extra = os.environ.get('GPA_SCALE_PATH')
+    if extra:
+        paths.extend(path for path in extra.split(os.pathsep) if path)
+    return paths
+
+registry = ScaleRegistry(_default_paths())
+
+def get_policy(name='gcuf'):
+    """Compiled grading policy from the default registry"""
+    return registry.get(name)
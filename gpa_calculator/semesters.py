@@ -0,0 +1,89 @@
+from gpa_calculator.fixed import gpa, quality_hundredths
+
+class AcademicRecord:
+    """Multi-term record with per-term prefix sums for O(1) GPA queries.
+    
+    Terms are appended in order as lists of graded Course objects. A course
+    repeated in a later term only counts once towards the CGPA, with its
+    best attempt (highest grade points) replacing earlier ones. Quality
+    points are kept in integer hundredths so the sums stay exact; with
+    exact=True GPAs are rounded like GPACalculator(exact=True).
+    """
+
+    def __init__(self, exact=False):
+        self.exact = exact
+        self.term_names = []
+        self.terms = []
+        # Raw totals of each term's own courses
+        self.term_quality = []
+        self.term_credits = []
+        # Cumulative best-attempt totals up to and including each term
+        self.prefix_quality = [0]
+        self.prefix_credits = [0]
+        # course name -> best graded attempt so far
+        self.best_attempts = {}
+
+    def add_term(self, name, courses):
+        """Append a term's graded courses and return its index"""
+        courses = list(courses)
+        quality = quality_hundredths(course.quality_points for course in courses)
+        credits = sum(course.credit_hours for course in courses)
+        
+        # Change in the cumulative totals, with repeated courses only
+        # replacing an earlier attempt when they improve on it
+        delta_quality = 0
+        delta_credits = 0
+        for course in courses:
+            previous = self.best_attempts.get(course.name)
+            if previous is not None:
+                if course.grade_value <= previous.grade_value:
+                    continue
+                delta_quality -= round(previous.quality_points * 100)
+                delta_credits -= previous.credit_hours
+            self.best_attempts[course.name] = course
+            delta_quality += round(course.quality_points * 100)
+            delta_credits += course.credit_hours
+        
+        self.term_names.append(name)
+        self.terms.append(courses)
+        self.term_quality.append(quality)
+        self.term_credits.append(credits)
+        self.prefix_quality.append(self.prefix_quality[-1] + delta_quality)
+        self.prefix_credits.append(self.prefix_credits[-1] + delta_credits)
+        return len(self.terms) - 1
+
+    def term_index(self, name):
+        return self.term_names.index(name)
+
+    def term_gpa(self, term):
+        """GPA of a single term's own courses"""
+        credits = self.term_credits[term]
+        return gpa(self.term_quality[term], credits, self.exact)
+
+    def cgpa(self, upto=None):
+        """Cumulative GPA up to and including term index `upto` (default: all terms)"""
+        k = len(self.terms) if upto is None else upto + 1
+        credits = self.prefix_credits[k]
+        return gpa(self.prefix_quality[k], credits, self.exact)
+
+    def total_credits(self, upto=None):
+        k = len(self.terms) if upto is None else upto + 1
+        return self.prefix_credits[k]
+
+    def total_quality_points(self, upto=None):
+        k = len(self.terms) if upto is None else upto + 1
+        return self.prefix_quality[k] / 100
+
+    def what_if_retake(self, retake):
+        """CGPA if a graded retake attempt were added now (best attempt counts)"""
+        quality = self.prefix_quality[-1]
+        credits = self.prefix_credits[-1]
+        previous = self.best_attempts.get(retake.name)
+        if previous is not None:
+            if retake.grade_value <= previous.grade_value:
+                return self.cgpa()
+            quality -= round(previous.quality_points * 100)
+            credits -= previous.credit_hours
+        quality += round(retake.quality_points * 100)
+        credits += retake.credit_hours
+        return gpa(quality, credits, self.exact)
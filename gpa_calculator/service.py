@@ -0,0 +1,336 @@
+"""Asyncio HTTP grading service with request micro-batching.
+
+Runs with the standard library only (python -m gpa_calculator serve). The
+same GradingService can also be mounted in any ASGI server, since
+GradingService.asgi is an ASGI application.
+
+    POST /grade       {"courses": [{"credits": 3, "mids": 15, "final": 22, "sectional": 8},
+                                   {"credits": 4, "obtained": 80}, ...]}
+    POST /transcript  {"courses": [{"name": "Math", "credits": 3, "grade": "A"}, ...]}
+    GET  /metrics     latency percentiles, batch sizes, queue depth and
+                      (with GPA_INSTRUMENT set) hot-path timers
+    GET  /health
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from gpa_calculator import instrumentation
+from gpa_calculator.fixed import gpa, quality_hundredths
+from gpa_calculator.grading import GPACalculator
+
+GRADE_FIELDS = ['percentage', 'grade_value', 'grade_letter', 'quality_points']
+
+# Optional numeric course fields
+MARK_FIELDS = ['mids', 'final', 'sectional', 'obtained']
+
+# Largest request body accepted, in bytes
+MAX_BODY = 10 * 2**20
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class RequestError(Exception):
+    """Raised for requests the service rejects, with the HTTP status to send"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class LatencyTracker:
+    """Recent request latencies per endpoint, for percentile reporting"""
+
+    def __init__(self, window=10_000):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+
+    def record(self, endpoint, seconds):
+        self.samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def percentiles(self):
+        report = {}
+        for endpoint, samples in self.samples.items():
+            ordered = sorted(samples)
+            def pick(q):
+                return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+            report[endpoint] = {
+                'count': self.counts[endpoint],
+                'p50_ms': pick(0.50),
+                'p90_ms': pick(0.90),
+                'p99_ms': pick(0.99),
+                'max_ms': round(ordered[-1] * 1000, 3),
+            }
+        return report
+
+class GradingService:
+    """Grades courses for HTTP clients, coalescing concurrent requests.
+    
+    Requests are queued and a single batcher task drains the queue into
+    micro-batches of up to max_batch courses (waiting at most max_wait
+    seconds for more to arrive), grading each batch with one vectorized
+    grade_frame call. The queue holds at most max_pending requests; beyond
+    that new requests are rejected with 503 so clients back off instead of
+    piling up latency.
+    """
+
+    def __init__(self, calculator=None, max_batch=50_000, max_wait=0.002, max_pending=1_000):
+        self.calculator = calculator or GPACalculator()
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.queue = None
+        self.batcher = None
+        self.latency = LatencyTracker()
+        self.batches = 0
+        self.batched_courses = 0
+        self.rejected = 0
+
+    async def start(self):
+        if self.batcher is None:
+            self.queue = asyncio.Queue(self.max_pending)
+            self.batcher = asyncio.create_task(self._run_batcher())
+
+    async def stop(self):
+        if self.batcher is not None:
+            self.batcher.cancel()
+            try:
+                await self.batcher
+            except asyncio.CancelledError:
+                pass
+            self.batcher = None
+
+    async def grade(self, courses):
+        """Grade a list of course dicts through the micro-batcher"""
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((courses, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise RequestError(503, "Grading queue is full, retry later")
+        return await future
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            
+            self.batches += 1
+            self.batched_courses += size
+            try:
+                # Graded off the event loop so new requests keep arriving
+                results = await loop.run_in_executor(None, self._grade_batch, [courses for courses, _ in batch])
+            except Exception:
+                # Regrade each request on its own so only the bad one fails
+                results = []
+                for courses, _ in batch:
+                    try:
+                        results.append((await loop.run_in_executor(None, self._grade_batch, [courses]))[0])
+                    except Exception as error:
+                        results.append(RequestError(400, f"Could not grade courses: {error}"))
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, RequestError):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _grade_batch(self, requests):
+        import pandas as pd
+        
+        rows = [self._row(course) for courses in requests for course in courses]
+        graded = self.calculator.grade_frame(pd.DataFrame(rows))
+        columns = {field: graded[field].tolist() for field in GRADE_FIELDS}
+        
+        results = []
+        start = 0
+        for courses in requests:
+            end = start + len(courses)
+            results.append([
+                {field: columns[field][i] for field in GRADE_FIELDS}
+                for i in range(start, end)
+            ])
+            start = end
+        return results
+
+    def _row(self, course):
+        """grade_frame row for a course, like transcript.grade_course_inputs"""
+        if course.get('obtained') is None:
+            return course
+        # Credit hours without a split are graded from one obtained total
+        return {**course, 'mids': course['obtained'], 'final': 0, 'sectional': 0}
+
+    def _courses(self, body):
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            raise RequestError(400, "Body must be JSON")
+        courses = payload.get('courses') if isinstance(payload, dict) else payload
+        if not isinstance(courses, list) or not all(isinstance(course, dict) for course in courses):
+            raise RequestError(400, "Expected {\"courses\": [{...}, ...]}")
+        # Checked per request so one bad course can't fail a whole micro-batch
+        for course in courses:
+            if not _is_number(course.get('credits')):
+                raise RequestError(400, "Every course needs numeric 'credits'")
+            for field in MARK_FIELDS:
+                if course.get(field) is not None and not _is_number(course[field]):
+                    raise RequestError(400, f"'{field}' must be a number or null")
+            if course.get('grade') is not None and not isinstance(course['grade'], str):
+                raise RequestError(400, "'grade' must be a letter grade string or null")
+            if course.get('obtained') is not None and sum(self.calculator.get_mark_split(course['credits'])[:3]) > 0:
+                raise RequestError(400, f"Use mids, final and sectional for {course['credits']:g} credit hours, not 'obtained'")
+        return courses
+
+    async def handle(self, method, path, body):
+        """Handle one request, returning (status, JSON-serializable payload)"""
+        start = time.perf_counter()
+        endpoint = f"{method} {path}"
+        try:
+            if method == 'POST' and path == '/grade':
+                courses = self._courses(body)
+                payload = {'courses': await self.grade(courses) if courses else []}
+            elif method == 'POST' and path == '/transcript':
+                courses = self._courses(body)
+                graded = await self.grade(courses) if courses else []
+                for course, result in zip(courses, graded):
+                    result['name'] = course.get('name', '')
+                    result['credits'] = course['credits']
+                hundredths = quality_hundredths(result['quality_points'] for result in graded)
+                total_credits = sum(course['credits'] for course in courses)
+                payload = {
+                    'courses': graded,
+                    'total_quality_points': hundredths / 100,
+                    'total_credits': total_credits,
+                    'gpa': gpa(hundredths, total_credits, self.calculator.exact),
+                }
+            elif method == 'GET' and path == '/metrics':
+                return 200, self.metrics()
+            elif method == 'GET' and path == '/health':
+                return 200, {'status': 'ok'}
+            else:
+                raise RequestError(404, f"No route for {endpoint}")
+        except RequestError as error:
+            return error.status, {'error': str(error)}
+        self.latency.record(endpoint, time.perf_counter() - start)
+        return 200, payload
+
+    def metrics(self):
+        metrics = {
+            'latency': self.latency.percentiles(),
+            'batches': self.batches,
+            'mean_batch_size': self.batched_courses / self.batches if self.batches else 0,
+            'queue_depth': self.queue.qsize() if self.queue else 0,
+            'rejected': self.rejected,
+        }
+        # Grading hot-path timers when GPA_INSTRUMENT is set
+        if instrumentation.ENABLED:
+            metrics['instrumentation'] = instrumentation.snapshot()
+        return metrics
+
+    async def asgi(self, scope, receive, send):
+        """ASGI application entry point"""
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await self.start()
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await self.stop()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if len(body) > MAX_BODY:
+                status, payload = 413, {'error': "Request body too large"}
+                break
+            if not message.get('more_body'):
+                status, payload = await self.handle(scope['method'], scope['path'], body)
+                break
+        
+        data = json.dumps(payload).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(data)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': data})
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+async def _handle_connection(service, reader, writer):
+    """Minimal HTTP/1.1 with keep-alive, enough to serve the JSON endpoints"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode('latin-1').split()
+            except ValueError:
+                break
+            
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            
+            length = int(headers.get('content-length') or 0)
+            if length > MAX_BODY:
+                status, payload = 413, {'error': "Request body too large"}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await service.handle(method, target.split('?')[0], body)
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+            
+            data = json.dumps(payload).encode()
+            head = [
+                f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(data)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            ]
+            if status == 503:
+                head.append("Retry-After: 1")
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(service, host='127.0.0.1', port=8000):
+    """Serve a GradingService over HTTP until cancelled"""
+    await service.start()
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(service, reader, writer), host, port
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
@@ -0,0 +1,183 @@
+"""Monte Carlo GPA projections over pending finals and sectionals.
+
+Pending marks are drawn from a distribution per component (final and
+sectional), given as a fraction of the component's maximum: BetaMarks for
+an assumed mean and spread, or EmpiricalMarks resampled from historical
+results (see fit_marks). Every sample is graded with the same arithmetic
+as calculate_from_marks, vectorized over the whole batch of samples.
+"""
+from dataclasses import dataclass
+import numpy as np
+from gpa_calculator.fixed import array_hundredths, gpa, quality_hundredths, target_hundredths, to_hundredths
+
+class BetaMarks:
+    """Pending marks as a Beta-distributed fraction of the maximum"""
+
+    def __init__(self, mean=0.6, sd=0.15):
+        if not 0 < mean < 1:
+            raise ValueError(f"Mean must be between 0 and 1, not {mean}")
+        if not 0 < sd ** 2 < mean * (1 - mean):
+            raise ValueError(f"Spread {sd} is not possible for a mean of {mean}")
+        self.mean = mean
+        self.sd = sd
+        # Method of moments
+        common = mean * (1 - mean) / sd ** 2 - 1
+        self.alpha = mean * common
+        self.beta = (1 - mean) * common
+
+    @classmethod
+    def fit(cls, fractions):
+        """Beta matching the mean and spread of observed fractions of the maximum"""
+        fractions = np.clip(np.asarray(fractions, dtype=float), 0.001, 0.999)
+        mean = fractions.mean()
+        # Keep the spread inside what a Beta with this mean allows
+        sd = min(fractions.std(), 0.99 * np.sqrt(mean * (1 - mean)))
+        return cls(mean, max(sd, 1e-3))
+
+    def sample(self, rng, size):
+        return rng.beta(self.alpha, self.beta, size)
+
+class EmpiricalMarks:
+    """Pending marks resampled from observed fractions of the maximum"""
+
+    def __init__(self, fractions):
+        fractions = np.asarray(fractions, dtype=float)
+        self.fractions = np.clip(fractions[~np.isnan(fractions)], 0, 1)
+        if len(self.fractions) == 0:
+            raise ValueError("No observed marks to resample")
+
+    @property
+    def mean(self):
+        return self.fractions.mean()
+
+    def sample(self, rng, size):
+        return rng.choice(self.fractions, size)
+
+def fit_marks(frame, calculator, kind='empirical'):
+    """(final, sectional) distributions fitted to historical enrollments.
+
+    `frame` needs credits, final and sectional columns; marks are taken as
+    fractions of each row's mark split, so 2 and 3 credit courses pool
+    together. `kind` is 'empirical' (resample the observed results) or
+    'beta' (smooth Beta fit).
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(frame)
+    credits = pd.to_numeric(frame['credits'], errors='coerce')
+    fitted = []
+    for position, column in ((1, 'final'), (2, 'sectional')):
+        maxima = credits.map(lambda hours: calculator.get_mark_split(hours)[position] if pd.notna(hours) else 0)
+        marks = pd.to_numeric(frame[column], errors='coerce') if column in frame else pd.Series(np.nan, index=frame.index)
+        usable = (maxima > 0) & marks.notna()
+        if not usable.any():
+            raise ValueError(f"No {column} marks to fit")
+        fractions = (marks[usable] / maxima[usable]).to_numpy(dtype=float)
+        fitted.append(BetaMarks.fit(fractions) if kind == 'beta' else EmpiricalMarks(fractions))
+    return tuple(fitted)
+
+def _draw(distribution, rng, size, maximum, step):
+    marks = distribution.sample(rng, size) * maximum
+    if step:
+        marks = np.round(marks / step) * step
+    return np.clip(marks, 0, maximum)
+
+def _quality_hundredths(calculator, course, final, sectional):
+    """Quality points in hundredths for a course at arrays of final/sectional marks"""
+    max_mids, max_final, max_sectional, total_marks = calculator.get_mark_split(course.credit_hours)
+    if calculator.exact:
+        n = len(final)
+        _, _, _, quality = calculator.fixed.grade_arrays(
+            np.full(n, course.credit_hours),
+            np.full(n, to_hundredths(course.mids)),
+            array_hundredths(final),
+            array_hundredths(sectional)
+        )
+        return quality
+    # Same arithmetic as calculate_from_marks
+    obtained_marks = course.mids + final + sectional
+    points = calculator.scale.lookup_points((obtained_marks / total_marks) * 100)
+    return array_hundredths(points) * course.credit_hours
+
+@dataclass
+class GPASimulation:
+    """Simulated GPA distribution, as sample counts per total quality hundredths"""
+    counts: np.ndarray
+    credits: int
+    # GPAs rounded like GPACalculator(exact=True)
+    exact: bool = False
+
+    @property
+    def samples(self):
+        return int(self.counts.sum())
+
+    @property
+    def gpas(self):
+        """GPA for each entry of counts"""
+        return gpa(np.arange(len(self.counts)), self.credits, self.exact)
+
+    @property
+    def mean(self):
+        return float((self.gpas * self.counts).sum() / self.samples)
+
+    def quantiles(self, qs=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """{q: GPA} such that a fraction q of the samples are at or below it"""
+        cumulative = np.cumsum(self.counts)
+        gpas = self.gpas
+        return {q: float(gpas[np.searchsorted(cumulative, q * self.samples)]) for q in qs}
+
+    def probability_at_least(self, target):
+        """Chance of finishing with a GPA of at least target"""
+        needed = target_hundredths(target, self.credits, self.exact)
+        return float(self.counts[needed:].sum() / self.samples) if needed > 0 else 1.0
+
+    def histogram(self, bin_width=0.1):
+        """Probability per GPA bin as a DataFrame"""
+        import pandas as pd
+
+        top = self.gpas[-1]
+        edges = np.arange(0, top + bin_width, bin_width)
+        probabilities, edges = np.histogram(self.gpas, bins=edges, weights=self.counts / self.samples)
+        labels = [f"{low:.2f}–{high:.2f}" for low, high in zip(edges[:-1], edges[1:])]
+        return pd.DataFrame({'gpa': labels, 'probability': probabilities})
+
+def simulate_gpa(calculator, pending, completed=(), final=None, sectional=None,
+                 samples=1_000_000, step=0.5, seed=None, batch_size=250_000):
+    """Monte Carlo distribution of the GPA once pending courses are graded.
+
+    `pending` is a list of PendingCourse (mids recorded, final and maybe
+    sectional still to come) and `completed` already graded Course objects
+    counted in the GPA. Finals are drawn from `final` and pending
+    sectionals from `sectional` (default: same as final), rounded to
+    `step` marks. Samples are graded in batches of batch_size and only a
+    count per reachable total is kept, so memory doesn't grow with the
+    number of samples.
+    """
+    final = final or BetaMarks()
+    sectional = sectional or final
+    rng = np.random.default_rng(seed)
+
+    base = quality_hundredths(course.quality_points for course in completed)
+    credits = sum(course.credit_hours for course in completed) + sum(course.credit_hours for course in pending)
+    if credits <= 0:
+        raise ValueError("No credit hours to compute a GPA over")
+
+    top = round(max(points for _, _, points in calculator.scale.bands) * 100)
+    counts = np.zeros(base + top * sum(course.credit_hours for course in pending) + 1, dtype=np.int64)
+
+    for start in range(0, samples, batch_size):
+        size = min(batch_size, samples - start)
+        quality = np.full(size, base, dtype=np.int64)
+        for course in pending:
+            _, max_final, max_sectional, _ = calculator.get_mark_split(course.credit_hours)
+            if max_final == 0:
+                raise ValueError(f"{course.name}: no mark split for {course.credit_hours} credit hours")
+            finals = _draw(final, rng, size, max_final, step)
+            if course.sectional is None:
+                sectionals = _draw(sectional, rng, size, max_sectional, step)
+            else:
+                sectionals = np.full(size, float(course.sectional))
+            quality += _quality_hundredths(calculator, course, finals, sectionals)
+        counts += np.bincount(quality, minlength=len(counts))
+
+    return GPASimulation(counts, credits, calculator.exact)
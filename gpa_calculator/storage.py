@@ -0,0 +1,246 @@
+import sqlite3
+from itertools import groupby
+from gpa_calculator.fixed import gpa
+from gpa_calculator.grading import GPACalculator
+from gpa_calculator.records import CourseTable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    name TEXT,
+    total_credits INTEGER NOT NULL DEFAULT 0,
+    quality_hundredths INTEGER NOT NULL DEFAULT 0,
+    cgpa REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS students_cgpa ON students (cgpa);
+
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL REFERENCES students (student_id),
+    term_id INTEGER NOT NULL REFERENCES terms (term_id),
+    course TEXT NOT NULL,
+    credits INTEGER NOT NULL,
+    input_method TEXT NOT NULL,
+    mids REAL,
+    final REAL,
+    sectional REAL,
+    percentage REAL NOT NULL,
+    grade_value REAL NOT NULL,
+    grade_letter TEXT NOT NULL,
+    quality_points REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS courses_student_term ON courses (student_id, term_id);
+CREATE INDEX IF NOT EXISTS courses_grade ON courses (grade_letter);
+CREATE INDEX IF NOT EXISTS courses_course_grade ON courses (course, grade_letter);
+"""
+
+INSERT_COURSE = """
+INSERT INTO courses (
+    student_id, term_id, course, credits, input_method, mids, final, sectional,
+    percentage, grade_value, grade_letter, quality_points
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Running CGPA per student, kept up to date on every insert so top-N and
+# threshold queries are index lookups instead of GROUP BYs over all courses
+UPSERT_TOTALS = """
+INSERT INTO students (student_id, total_credits, quality_hundredths, cgpa)
+VALUES (?1, ?2, ?3, gpa(?3, ?2))
+ON CONFLICT (student_id) DO UPDATE SET
+    total_credits = total_credits + excluded.total_credits,
+    quality_hundredths = quality_hundredths + excluded.quality_hundredths,
+    cgpa = gpa(quality_hundredths + excluded.quality_hundredths, total_credits + excluded.total_credits)
+"""
+
+class TranscriptStore:
+    """SQLite storage for students, terms and graded courses.
+    
+    Uses WAL mode so readers (e.g. the app or analytics) aren't blocked by
+    bulk loads, and inserts each batch with one prepared executemany in a
+    single transaction. Grading itself always goes through GPACalculator;
+    the store only persists the results.
+    """
+
+    def __init__(self, path, calculator=None):
+        self.calculator = calculator or GPACalculator()
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        # The same GPA arithmetic as everywhere else, for UPSERT_TOTALS
+        exact = self.calculator.exact
+        self.connection.create_function(
+            "gpa", 2, lambda hundredths, credits: gpa(hundredths, credits, exact), deterministic=True
+        )
+        self.connection.executescript(SCHEMA)
+        self.term_ids = dict(
+            (name, term_id) for term_id, name in self.connection.execute("SELECT term_id, name FROM terms")
+        )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _term_id(self, name):
+        term_id = self.term_ids.get(name)
+        if term_id is None:
+            # None and NaN (blank cells) would be silently skipped by INSERT OR IGNORE
+            if name is None or name != name:
+                raise ValueError("A row has no term; give a term for all rows or fill in the 'term' column")
+            self.connection.execute("INSERT OR IGNORE INTO terms (name) VALUES (?)", (name,))
+            term_id = self.connection.execute("SELECT term_id FROM terms WHERE name = ?", (name,)).fetchone()[0]
+            self.term_ids[name] = term_id
+        return term_id
+
+    def _insert(self, rows):
+        """Insert (student_id, term, course, credits, method, mids, final,
+        sectional, percentage, grade_value, grade_letter, quality_points) rows"""
+        totals = {}
+        prepared = []
+        for row in rows:
+            student_id, term = row[0], row[1]
+            prepared.append((student_id, self._term_id(term)) + tuple(row[2:]))
+            credits, quality_points = row[3], row[11]
+            student = totals.setdefault(student_id, [0, 0])
+            student[0] += credits
+            student[1] += round(quality_points * 100)
+        
+        self.connection.executemany(
+            UPSERT_TOTALS,
+            [(student_id, credits, hundredths) for student_id, (credits, hundredths) in totals.items()]
+        )
+        self.connection.executemany(INSERT_COURSE, prepared)
+        return len(prepared)
+
+    def add_courses(self, student_id, term, courses, name=None):
+        """Store a student's graded Course objects for a term"""
+        rows = []
+        for course in courses:
+            details = course.marks_details or {}
+            rows.append((
+                student_id, term, course.name, course.credit_hours, course.input_method,
+                details.get('mids'), details.get('final'), details.get('sectional'),
+                course.percentage, course.grade_value, course.grade_letter, course.quality_points
+            ))
+        with self.connection:
+            count = self._insert(rows)
+            if name is not None:
+                self.connection.execute("UPDATE students SET name = ? WHERE student_id = ?", (name, student_id))
+        return count
+
+    def add_frame(self, graded, term=None):
+        """Store rows graded by GPACalculator.grade_frame.
+        
+        The frame needs student_id and course columns, plus a term column
+        unless `term` is given, which then applies to all rows.
+        """
+        if term is None and 'term' not in graded:
+            raise ValueError("No term given and the frame has no 'term' column")
+        
+        def values(name, default=None):
+            if name in graded:
+                return graded[name].tolist()
+            return [default] * len(graded)
+        
+        methods = ['grade' if isinstance(grade, str) else 'marks' for grade in values('grade')]
+        rows = zip(
+            [str(student_id) for student_id in values('student_id')],
+            values('term') if term is None else [term] * len(graded),
+            values('course', ''),
+            [int(credits) for credits in values('credits', 0)],
+            methods,
+            values('mids'), values('final'), values('sectional'),
+            values('percentage'), values('grade_value'), values('grade_letter'), values('quality_points'),
+        )
+        with self.connection:
+            return self._insert(rows)
+
+    def import_enrollments(self, path, term=None, chunk_size=100_000):
+        """Grade an enrollment CSV/Parquet file chunk by chunk and store it"""
+        from gpa_calculator.batch import read_enrollments
+        
+        count = 0
+        for chunk in read_enrollments(path, chunk_size):
+            count += self.add_frame(self.calculator.grade_frame(chunk), term)
+        return count
+
+    def top_students(self, n=10):
+        """Highest CGPA students as (student_id, name, total_credits, cgpa)"""
+        return self.connection.execute(
+            "SELECT student_id, name, total_credits, cgpa FROM students ORDER BY cgpa DESC LIMIT ?", (n,)
+        ).fetchall()
+
+    def students_below(self, threshold=2.0):
+        """Students with a CGPA below threshold, lowest first"""
+        return self.connection.execute(
+            "SELECT student_id, name, total_credits, cgpa FROM students WHERE cgpa < ? ORDER BY cgpa",
+            (threshold,)
+        ).fetchall()
+
+    def grade_distribution(self, course=None):
+        """{letter: count} over all courses, or for one course"""
+        if course is None:
+            rows = self.connection.execute(
+                "SELECT grade_letter, COUNT(*) FROM courses GROUP BY grade_letter"
+            )
+        else:
+            rows = self.connection.execute(
+                "SELECT grade_letter, COUNT(*) FROM courses WHERE course = ? GROUP BY grade_letter", (course,)
+            )
+        return dict(rows.fetchall())
+
+    def student_courses(self, student_id, term=None):
+        """A student's stored courses as (term, course, credits, grade_letter, grade_value, quality_points)"""
+        query = """
+            SELECT terms.name, course, credits, grade_letter, grade_value, quality_points
+            FROM courses JOIN terms USING (term_id)
+            WHERE student_id = ?
+        """
+        params = [student_id]
+        if term is not None:
+            query += " AND term_id = ?"
+            params.append(self.term_ids.get(term, -1))
+        return self.connection.execute(query + " ORDER BY term_id, id", params).fetchall()
+
+    def iter_transcripts(self):
+        """Yield (student_id, name, courses, terms) per student, streamed from the database.
+        
+        Courses come back as a CourseTable in term order (stored grades are
+        kept, percentages are derived with this store's calculator); rows
+        come off one cursor ordered by the (student_id, term_id) index, so
+        only one student's courses are held at a time.
+        """
+        rows = self.connection.execute("""
+            SELECT courses.student_id, students.name, terms.name, course, credits, input_method,
+                   mids, final, sectional, percentage, grade_value, grade_letter, quality_points
+            FROM courses
+            JOIN students USING (student_id)
+            JOIN terms USING (term_id)
+            ORDER BY courses.student_id, term_id, courses.id
+        """)
+        for student_id, student_rows in groupby(rows, key=lambda row: row[0]):
+            courses = CourseTable(self.calculator)
+            terms = []
+            name = None
+            for (_, name, term, course, credits, method, mids, final, sectional,
+                 percentage, grade_value, grade_letter, quality_points) in student_rows:
+                courses.add_graded(course, credits, grade_value, grade_letter, method,
+                                   mids or 0.0, final or 0.0, sectional or 0.0)
+                terms.append(term)
+            yield student_id, name, courses, terms
+
+    def student_cgpa(self, student_id):
+        row = self.connection.execute(
+            "SELECT cgpa FROM students WHERE student_id = ?", (student_id,)
+        ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,178 @@
+from gpa_calculator import instrumentation
+from gpa_calculator.fixed import gpa
+from gpa_calculator.instrumentation import timed
+
+def grade_course_input(calculator, input_data):
+    """Grade one course entry as stored in the app's course_inputs"""
+    if input_data.get('method') == 'grade':
+        return calculator.calculate_from_grade(
+            input_data["name"],
+            input_data["credits"],
+            input_data["grade"]
+        )
+    
+    # marks-based, split into mids/final/sectional where the scale has a split
+    if sum(calculator.get_mark_split(input_data["credits"])[:3]) > 0:
+        return calculator.calculate_from_marks(
+            input_data["name"],
+            input_data["credits"],
+            input_data.get("mids", 0),
+            input_data.get("final", 0),
+            input_data.get("sectional", 0)
+        )
+    
+    # Generic calculation for other credit hours
+    return calculator.calculate_from_marks(
+        input_data["name"],
+        input_data["credits"],
+        input_data.get("obtained", 0),
+        0,
+        0
+    )
+
+@timed('transcript.grade_course_inputs')
+def grade_course_inputs(calculator, inputs):
+    """Grade many course entries with one vectorized grade_frame call.
+    
+    Gives the same Course objects as calling grade_course_input on each.
+    """
+    import pandas as pd
+    from gpa_calculator.grading import Course
+    
+    rows = []
+    for input_data in inputs:
+        credits = input_data["credits"]
+        if input_data.get('method') == 'grade':
+            rows.append((credits, 0, 0, 0, input_data["grade"]))
+        elif sum(calculator.get_mark_split(credits)[:3]) > 0:
+            rows.append((credits, input_data.get("mids", 0), input_data.get("final", 0), input_data.get("sectional", 0), None))
+        else:
+            # Generic calculation for other credit hours
+            rows.append((credits, input_data.get("obtained", 0), 0, 0, None))
+    
+    graded = calculator.grade_frame(pd.DataFrame(rows, columns=['credits', 'mids', 'final', 'sectional', 'grade']))
+    
+    courses = []
+    columns = zip(graded['grade_value'].tolist(), graded['grade_letter'].tolist(),
+                  graded['quality_points'].tolist(), graded['percentage'].tolist())
+    for input_data, (credits, mids, final, sectional, grade), (grade_value, grade_letter, quality_points, percentage) \
+            in zip(inputs, rows, columns):
+        if grade is not None:
+            courses.append(Course(
+                name=input_data["name"],
+                credit_hours=credits,
+                grade_value=grade_value,
+                grade_letter=grade_letter,
+                quality_points=quality_points,
+                input_method='grade',
+                percentage=calculator.letter_to_percentage.get(grade, 0)
+            ))
+            continue
+        max_mids, max_final, max_sectional, total_marks = calculator.get_mark_split(credits)
+        courses.append(Course(
+            name=input_data["name"],
+            credit_hours=credits,
+            grade_value=grade_value,
+            grade_letter=grade_letter,
+            quality_points=quality_points,
+            input_method='marks',
+            percentage=percentage,
+            marks_details={
+                'mids': mids,
+                'final': final,
+                'sectional': sectional,
+                'total_marks': total_marks,
+                'obtained': mids + final + sectional,
+                'max_mids': max_mids,
+                'max_final': max_final,
+                'max_sectional': max_sectional
+            }
+        ))
+    return courses
+
+def fingerprint(input_data):
+    """Hashable snapshot of a course entry's inputs"""
+    return tuple(sorted(input_data.items()))
+
+# Changed courses graded with one grade_frame call instead of one by one
+BATCH_THRESHOLD = 50
+
+class TranscriptTracker:
+    """Running transcript totals that only regrade courses whose inputs changed.
+    
+    Each course entry keeps its input fingerprint and graded Course, keyed
+    by the entry's "id" (or its position when it has none). On update()
+    unchanged entries keep their cached result, and changed, added or
+    removed ones swap their contribution in the running totals.
+    """
+
+    def __init__(self, calculator):
+        self.calculator = calculator
+        # key -> (fingerprint, Course or None), in course_inputs order
+        self.entries = {}
+        # Quality points in integer hundredths so add/remove never drifts
+        self.quality_hundredths = 0
+        self.total_credits = 0
+        # Courses regraded by the last update()
+        self.regraded = 0
+
+    def _add(self, course):
+        if course is not None:
+            self.quality_hundredths += round(course.quality_points * 100)
+            self.total_credits += course.credit_hours
+
+    def _remove(self, course):
+        if course is not None:
+            self.quality_hundredths -= round(course.quality_points * 100)
+            self.total_credits -= course.credit_hours
+
+    @timed('transcript.update')
+    def update(self, course_inputs):
+        """Bring the transcript in line with course_inputs and return its courses"""
+        entries = {}
+        changed = []
+        
+        for i, input_data in enumerate(course_inputs):
+            key = ('id', input_data['id']) if 'id' in input_data else ('position', i)
+            fingerprint_now = fingerprint(input_data)
+            old = self.entries.pop(key, None)
+            if old is not None and old[0] == fingerprint_now:
+                entries[key] = old
+                continue
+            if old is not None:
+                self._remove(old[1])
+            entries[key] = (fingerprint_now, None)
+            # Courses without a name are left out of the transcript
+            if input_data["name"]:
+                changed.append((key, input_data))
+        
+        # Whatever is left was removed from course_inputs
+        for _, course in self.entries.values():
+            self._remove(course)
+        
+        # Large changes (e.g. a bulk import) go through the batch grader
+        if len(changed) >= BATCH_THRESHOLD:
+            courses = grade_course_inputs(self.calculator, [input_data for _, input_data in changed])
+        else:
+            courses = [grade_course_input(self.calculator, input_data) for _, input_data in changed]
+        for (key, _), course in zip(changed, courses):
+            entries[key] = (entries[key][0], course)
+            self._add(course)
+        
+        self.regraded = len(changed)
+        instrumentation.count('transcript.regraded', len(changed))
+        self.entries = entries
+        
+        return self.courses
+    
+    @property
+    def courses(self):
+        return [course for _, course in self.entries.values() if course is not None]
+
+    @property
+    def total_quality_points(self):
+        return self.quality_hundredths / 100
+
+    @property
+    def gpa(self):
+        return gpa(self.quality_hundredths, self.total_credits, self.calculator.exact)
@@ -1,252 +1,434 @@
 import streamlit as st
-import pandas as pd
-from dataclasses import dataclass
+from gpa_calculator import GPACalculator, GradingCache, instrumentation, registry
+from gpa_calculator.importer import CREDIT_OPTIONS, parse_course_frame, read_course_file
+from gpa_calculator.transcript import TranscriptTracker
 
-@dataclass
-class Course:
-    name: str
-    credit_hours: int
-    grade_value: float
-    grade_letter: str
-    quality_points: float
-    input_method: str
-    percentage: float = 0.0
-    marks_details: dict = None
+@st.cache_resource
+def get_calculator(scale="gcuf", exact=False):
+    """One calculator (and compiled grading tables) per scale and process, shared by all sessions"""
+    return GPACalculator(scale, exact)
 
-class GPACalculator:
-    def __init__(self):
-        # Complete GCUF grading scale (from your image)
-        self.grading_scale = [
-            (85, 100, 4.00), (84, 84.99, 3.95), (83, 83.99, 3.90),
-            (82, 82.99, 3.85), (81, 81.99, 3.80), (80, 80.99, 3.75),
-            (79, 79.99, 3.70), (78, 78.99, 3.65), (77, 77.99, 3.60),
-            (76, 76.99, 3.55), (75, 75.99, 3.50), (74, 74.99, 3.45),
-            (73, 73.99, 3.40), (72, 72.99, 3.35), (71, 71.99, 3.30),
-            (70, 70.99, 3.25), (69, 69.99, 3.20), (68, 68.99, 3.15),
-            (67, 67.99, 3.10), (66, 66.99, 3.05), (65, 65.99, 3.00),
-            (64, 64.99, 2.94), (63, 63.99, 2.88), (62, 62.99, 2.82),
-            (61, 61.99, 2.76), (60, 60.99, 2.70), (59, 59.99, 2.63),
-            (58, 58.99, 2.56), (57, 57.99, 2.49), (56, 56.99, 2.42),
-            (55, 55.99, 2.35), (54, 54.99, 2.28), (53, 53.99, 2.21),
-            (52, 52.99, 2.14), (51, 51.99, 2.07), (50, 50.99, 2.00),
-            (49, 49.99, 1.90), (48, 48.99, 1.80), (47, 47.99, 1.70),
-            (46, 46.99, 1.60), (45, 45.99, 1.50), (44, 44.99, 1.40),
-            (43, 43.99, 1.30), (42, 42.99, 1.20), (41, 41.99, 1.10),
-            (40, 40.99, 1.00), (0, 39.99, 0.00)
-        ]
-        
-        # Letter grade mapping for display
-        self.grade_to_letter = {
-            4.00: 'A', 3.95: 'A', 3.90: 'A', 3.85: 'A', 3.80: 'A', 3.75: 'A',
-            3.70: 'B+', 3.65: 'B+', 3.60: 'B+', 3.55: 'B+',
-            3.50: 'B', 3.45: 'B', 3.40: 'B', 3.35: 'B', 3.30: 'B', 3.25: 'B',
-            3.20: 'B', 3.15: 'B', 3.10: 'B', 3.05: 'B', 3.00: 'B',
-            2.94: 'C', 2.88: 'C', 2.82: 'C', 2.76: 'C', 2.70: 'C',
-            2.63: 'C', 2.56: 'C', 2.49: 'C', 2.42: 'C', 2.35: 'C',
-            2.28: 'C', 2.21: 'C', 2.14: 'C', 2.07: 'C', 2.00: 'C',
-            1.90: 'D', 1.80: 'D', 1.70: 'D', 1.60: 'D', 1.50: 'D',
-            1.40: 'D', 1.30: 'D', 1.20: 'D', 1.10: 'D', 1.00: 'D',
-            0.00: 'F'
-        }
+@st.cache_resource
+def get_grading_cache(scale="gcuf", exact=False):
+    """Grading results memoized once per scale and process, shared by all sessions"""
+    return GradingCache(get_calculator(scale, exact), maxsize=10_000)
 
-    def get_grade_from_percentage(self, percentage):
-        """Get grade points from percentage using GCUF scale"""
-        for low, high, points in self.grading_scale:
-            if low <= percentage <= high:
-                return points
-        return 0.00
+@st.cache_resource(max_entries=8, show_spinner="Grading cohort…")
+def get_cohort_aggregates(file_id, _file, scale="gcuf", exact=False):
+    """Aggregates for an uploaded enrollment file, computed once per file and scale"""
+    from gpa_calculator.analytics import CohortAggregates
+    return CohortAggregates.from_file(_file, get_calculator(scale, exact))
 
-    def calculate_from_grade(self, name, credit_hours, grade_letter):
-        """Calculate from direct grade selection"""
-        # Map letter grades to approximate percentages (for display)
-        grade_to_percentage = {
-            'A': 85, 'B': 70, 'C': 55, 'D': 45, 'F': 30
-        }
-        
-        # Get grade points based on letter
-        if grade_letter == 'A':
-            grade_value = 4.00
-        elif grade_letter == 'B':
-            grade_value = 3.00
-        elif grade_letter == 'C':
-            grade_value = 2.00
-        elif grade_letter == 'D':
-            grade_value = 1.00
-        else:
-            grade_value = 0.00
-            
-        quality_points = grade_value * credit_hours
-        
-        return Course(
-            name=name,
-            credit_hours=credit_hours,
-            grade_value=grade_value,
-            grade_letter=grade_letter,
-            quality_points=quality_points,
-            input_method='grade',
-            percentage=grade_to_percentage.get(grade_letter, 0)
-        )
+@st.cache_resource(max_entries=8, show_spinner="Fitting past results…")
+def get_fitted_marks(file_id, _file, scale="gcuf", kind="empirical"):
+    """(final, sectional) distributions fitted to an uploaded file of past enrollments"""
+    import pandas as pd
+    from gpa_calculator.batch import read_enrollments
+    from gpa_calculator.simulation import fit_marks
+    frame = pd.concat(read_enrollments(_file), ignore_index=True)
+    return fit_marks(frame, get_calculator(scale), kind)
 
-    def calculate_from_marks(self, name, credit_hours, mids, final, sectional):
-        """Calculate from marks based on credit hours"""
-        
-        # Set max marks based on credit hours
-        if credit_hours == 3:
-            max_mids, max_final, max_sectional = 20, 30, 10
-            total_marks = 60
-        elif credit_hours == 2:
-            max_mids, max_final, max_sectional = 15, 20, 5
-            total_marks = 40
-        else:
-            # Default for other credit hours
-            max_mids, max_final, max_sectional = 0, 0, 0
-            total_marks = 100
-        
-        # Calculate percentage
-        obtained_marks = mids + final + sectional
-        percentage = (obtained_marks / total_marks) * 100 if total_marks > 0 else 0
-        
-        # Get grade points from percentage
-        grade_value = self.get_grade_from_percentage(percentage)
-        
-        # Get letter grade
-        grade_letter = 'F'
-        for points, letter in sorted([(k, v) for k, v in self.grade_to_letter.items()], reverse=True):
-            if grade_value >= points:
-                grade_letter = letter
-                break
-        
-        quality_points = grade_value * credit_hours
-        
-        # Store marks details
-        marks_details = {
-            'mids': mids,
-            'final': final,
-            'sectional': sectional,
-            'total_marks': total_marks,
-            'obtained': obtained_marks,
-            'max_mids': max_mids,
-            'max_final': max_final,
-            'max_sectional': max_sectional
-        }
-        
-        return Course(
-            name=name,
-            credit_hours=credit_hours,
-            grade_value=grade_value,
-            grade_letter=grade_letter,
-            quality_points=quality_points,
-            input_method='marks',
-            percentage=percentage,
-            marks_details=marks_details
-        )
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_transcript(fmt, student_id, name, course_rows, exact=False):
+    """Transcript download bytes, rendered once per distinct transcript and format"""
+    from gpa_calculator.export import render
+    from gpa_calculator.grading import Course
+    return render(fmt, student_id, [Course(*row) for row in course_rows], name, exact=exact)
+
+def completed_courses(completed):
+    """Course stand-ins for (credits, quality points) pairs of already graded courses"""
+    from gpa_calculator.grading import Course
+    return [
+        Course(name="", credit_hours=credits, grade_value=0.0, grade_letter="", quality_points=quality_points, input_method="grade")
+        for credits, quality_points in completed
+    ]
+
+@st.cache_data(max_entries=32, show_spinner="Simulating…")
+def run_projection(scale, exact, pending, completed, distributions, samples, _fitted=None):
+    """Simulated GPA distribution, cached on the (small, hashable) inputs"""
+    from gpa_calculator import PendingCourse
+    from gpa_calculator.simulation import BetaMarks, simulate_gpa
+    
+    if _fitted is not None:
+        final, sectional = _fitted
+    else:
+        (final_mean, final_sd), (sectional_mean, sectional_sd) = distributions
+        final, sectional = BetaMarks(final_mean, final_sd), BetaMarks(sectional_mean, sectional_sd)
+    return simulate_gpa(
+        get_calculator(scale, exact), [PendingCourse(*course) for course in pending], completed_courses(completed),
+        final, sectional, samples=samples, seed=0
+    )
+
+@st.cache_data(max_entries=32)
+def plan_target(scale, exact, target, pending, completed):
+    """Least final (and pending sectional) marks per course for a target GPA, or None if out of reach"""
+    from gpa_calculator import PendingCourse
+    from gpa_calculator.planner import solve_target_gpa
+    
+    planned = solve_target_gpa(
+        get_calculator(scale, exact), target, [PendingCourse(*course) for course in pending], completed_courses(completed)
+    )
+    if planned is None:
+        return None
+    rows = []
+    for (_, _, _, recorded_sectional), course in zip(pending, planned):
+        details = course.marks_details
+        rows.append({
+            "Course": course.name,
+            "Final Needed": f"{details['final']:g} / {details['max_final']:g}",
+            "Sectional Needed": "recorded" if recorded_sectional is not None else f"{details['sectional']:g} / {details['max_sectional']:g}",
+            "Grade": course.grade_letter,
+        })
+    return rows
 
-# Custom dark theme CSS (keeping your existing CSS)
+# Custom dark theme CSS (keeping your existing CSS), served once from
+# static/dark_theme.css instead of being re-sent on every rerun
 def apply_dark_theme():
-    st.markdown("""
-        <style>
-        /* Main background */
-        .stApp {
-            background-color: #1E1E1E;
-            color: #FFFFFF;
-        }
-        
-        /* Headers */
-        h1, h2, h3, h4, h5, h6 {
-            color: #FFFFFF !important;
-        }
-        
-        /* Text elements */
-        p, li, span, div {
-            color: #E0E0E0;
-        }
-        
-        /* Input fields */
-        .stTextInput > div > div > input {
-            background-color: #2D2D2D;
-            color: #FFFFFF;
-            border-color: #404040;
-            border-radius: 5px;
-        }
-        
-        .stNumberInput > div > div > input {
-            background-color: #2D2D2D;
-            color: #FFFFFF;
-            border-color: #404040;
-            border-radius: 5px;
-        }
-        
-        /* Selectbox/Dropdown */
-        .stSelectbox > div > div {
-            background-color: #2D2D2D !important;
-            color: #FFFFFF !important;
-            border-color: #404040 !important;
-            border-radius: 5px;
-        }
-        
-        /* Radio buttons */
-        .stRadio > div {
-            background-color: #2D2D2D;
-            padding: 10px;
-            border-radius: 5px;
-        }
+    st.markdown('<link rel="stylesheet" href="app/static/dark_theme.css">', unsafe_allow_html=True)
+
+# Courses shown per page in the card editor
+COURSES_PER_PAGE = 10
+
+GRADE_OPTIONS = ['A', 'B', 'C', 'D', 'F']
+
+# MIME types for transcript downloads
+DOWNLOAD_TYPES = {"csv": "text/csv", "json": "application/json", "pdf": "application/pdf"}
+
+def new_course(method, **values):
+    """New course entry with a stable id, used for widget keys"""
+    course_id = st.session_state.next_course_id
+    st.session_state.next_course_id += 1
+    if method == "grade":
+        course = {"id": course_id, "name": "", "credits": 3, "grade": "A", "method": "grade"}
+    else:
+        course = {"id": course_id, "name": "", "credits": 3, "mids": 0.0, "final": 0.0, "sectional": 0.0, "method": "marks"}
+    course.update(values)
+    return course
+
+def courses_changed():
+    """Course list changed outside the table editor; rebuild its data"""
+    st.session_state.editor_version += 1
+    st.session_state.pop("editor_added_ids", None)
+
+def show_last_page():
+    """Page the card editor to the end of the course list (where new courses go) on the next rerun"""
+    st.session_state.jump_to_last_page = True
+
+def render_course_card(calculator, course, number):
+    """Widgets for one course, keyed by its stable id"""
+    key = course["id"]
+    with st.container():
+        st.markdown(f"<div class='course-container'>", unsafe_allow_html=True)
         
-        /* Buttons */
-        .stButton > button {
-            background-color: #404040;
-            color: #FFFFFF;
-            border: 1px solid #555555;
-            border-radius: 5px;
-            padding: 10px 20px;
-            font-weight: bold;
-        }
+        # Show which method this course uses
+        method_text = "🎯 Grade" if course.get('method') == 'grade' else "📊 Marks"
+        st.markdown(f"**Course {number}** <span class='method-indicator'>{method_text}</span>", unsafe_allow_html=True)
         
-        .stButton > button:hover {
-            background-color: #555555;
-        }
+        # Course Name
+        course["name"] = st.text_input(
+            "Course Name", 
+            value=course["name"],
+            key=f"name_{key}",
+            placeholder="e.g., Mathematics"
+        )
         
-        .stButton > button[kind="primary"] {
-            background-color: #0066CC;
-            border: 1px solid #0077FF;
-        }
+        # Credit Hours
+        default_index = CREDIT_OPTIONS.index(course["credits"]) if course["credits"] in CREDIT_OPTIONS else 2
         
-        /* Course container */
-        .course-container {
-            background-color: #2D2D2D;
-            padding: 20px;
-            border-radius: 10px;
-            border: 1px solid #404040;
-            margin-bottom: 15px;
-        }
+        course["credits"] = st.selectbox(
+            "Credit Hours",
+            options=CREDIT_OPTIONS,
+            index=default_index,
+            key=f"credits_{key}"
+        )
         
-        /* Course badge */
-        .course-badge {
-            background-color: #404040;
-            color: #FFFFFF;
-            padding: 8px 15px;
-            border-radius: 20px;
-            font-size: 14px;
-            display: inline-block;
-            margin-bottom: 15px;
-        }
+        # Show different inputs based on course method
+        if course.get('method') == 'grade':
+            grade_index = GRADE_OPTIONS.index(course["grade"]) if course["grade"] in GRADE_OPTIONS else 0
+            
+            course["grade"] = st.selectbox(
+                "Select Grade",
+                options=GRADE_OPTIONS,
+                index=grade_index,
+                key=f"grade_{key}",
+                help="A=4.0, B=3.0, C=2.0, D=1.0, F=0.0"
+            )
+            
+        else:  # marks-based
+            # Show appropriate marks fields based on credit hours
+            max_mids, max_final, max_sectional, total_marks = calculator.get_mark_split(course["credits"])
+            if max_mids + max_final + max_sectional > 0:
+                col_m1, col_m2, col_m3 = st.columns(3)
+                for column, field, label, max_marks in (
+                    (col_m1, "mids", "Mids", max_mids),
+                    (col_m2, "final", "Final", max_final),
+                    (col_m3, "sectional", "Sectional", max_sectional),
+                ):
+                    with column:
+                        course[field] = st.number_input(
+                            f"{label} (out of {max_marks})",
+                            min_value=0.0,
+                            max_value=float(max_marks),
+                            value=min(course.get(field, 0.0), float(max_marks)),
+                            step=0.5,
+                            key=f"{field}_{key}"
+                        )
+            else:
+                # Generic for other credit hours
+                course["obtained"] = st.number_input(
+                    "Total Marks Obtained",
+                    min_value=0.0,
+                    max_value=float(total_marks),
+                    value=min(course.get("obtained", 0.0), float(total_marks)),
+                    step=0.5,
+                    key=f"obtained_{key}"
+                )
         
-        /* Method indicator */
-        .method-indicator {
-            background-color: #0066CC;
-            color: white;
-            padding: 3px 10px;
-            border-radius: 15px;
-            font-size: 12px;
-            margin-left: 10px;
+        st.markdown("</div>", unsafe_allow_html=True)
+
+TABLE_COLUMNS = ["id", "name", "credits", "method", "grade", "mids", "final", "sectional", "obtained"]
+
+def render_course_table(calculator):
+    """Edit every course in one st.data_editor instead of a widget set per course"""
+    import pandas as pd
+    
+    # The editor's source data is only rebuilt when courses change outside
+    # it; otherwise its own edit state would be applied twice
+    version = st.session_state.editor_version
+    if st.session_state.get("editor_source_version") != version:
+        st.session_state.editor_source = pd.DataFrame(
+            [{column: course.get(column) for column in TABLE_COLUMNS} for course in st.session_state.course_inputs],
+            columns=TABLE_COLUMNS
+        )
+        st.session_state.editor_source_version = version
+    
+    edited = st.data_editor(
+        st.session_state.editor_source,
+        key=f"course_editor_{version}",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_order=TABLE_COLUMNS[1:],
+        column_config={
+            "name": st.column_config.TextColumn("Course Name"),
+            "credits": st.column_config.SelectboxColumn("Credit Hours", options=CREDIT_OPTIONS, default=3, required=True),
+            "method": st.column_config.SelectboxColumn("Method", options=["marks", "grade"], default="marks", required=True),
+            "grade": st.column_config.SelectboxColumn("Grade", options=GRADE_OPTIONS),
+            "mids": st.column_config.NumberColumn("Mids", min_value=0.0, step=0.5),
+            "final": st.column_config.NumberColumn("Final", min_value=0.0, step=0.5),
+            "sectional": st.column_config.NumberColumn("Sectional", min_value=0.0, step=0.5),
+            "obtained": st.column_config.NumberColumn("Obtained", min_value=0.0, step=0.5, help="Total marks for credit hours without a mids/final/sectional split"),
         }
+    )
+    
+    # Rebuild course_inputs from the edited rows, keeping ids stable and
+    # clamping marks to the maxima for each row's credit hours
+    # Rows added in the editor get ids once, reused on later reruns
+    added_ids = st.session_state.setdefault("editor_added_ids", {}).setdefault(version, [])
+    
+    courses = []
+    clamped = []
+    added = 0
+    for row in edited.to_dict("records"):
+        values = {column: row[column] for column in TABLE_COLUMNS[1:] if pd.notna(row[column])}
+        values.setdefault("name", "")
+        values["credits"] = int(values.get("credits", 3))
+        method = values.pop("method", "marks")
+        if pd.notna(row["id"]):
+            course = {"id": int(row["id"]), "method": method}
+            course.update(values)
+        else:
+            if added == len(added_ids):
+                added_ids.append(new_course(method)["id"])
+            course = {"id": added_ids[added], "method": method}
+            course.update(values)
+            added += 1
         
-        /* Success message */
-        .stSuccess {
-            background-color: #1E4A2E;
-            color: #FFFFFF;
+        if method == "grade":
+            course.setdefault("grade", "A")
+        else:
+            max_mids, max_final, max_sectional, total_marks = calculator.get_mark_split(course["credits"])
+            limits = {"mids": max_mids, "final": max_final, "sectional": max_sectional, "obtained": total_marks}
+            for field, limit in limits.items():
+                value = float(course.get(field, 0.0))
+                if value > limit:
+                    clamped.append(course["name"] or f"row {len(courses) + 1}")
+                    value = float(limit)
+                course[field] = value
+        courses.append(course)
+    
+    st.session_state.course_inputs = courses
+    if clamped:
+        st.warning(f"Marks above the maximum for the course's credit hours were capped: {', '.join(sorted(set(clamped)))}")
+
+PROJECTION_COLUMNS = ["name", "credits", "mids", "sectional"]
+
+def render_projection(scale, exact=False):
+    """Monte Carlo GPA projection over pending finals and sectionals"""
+    import pandas as pd
+    
+    st.subheader("🎲 GPA Projection")
+    st.markdown("Mids are recorded, finals are still to come: see how the GPA is likely to end up")
+    
+    if "projection_source" not in st.session_state:
+        st.session_state.projection_source = pd.DataFrame(
+            [{"name": "Course 1", "credits": 3, "mids": 0.0, "sectional": float("nan")}], columns=PROJECTION_COLUMNS
+        )
+    pending_rows = st.data_editor(
+        st.session_state.projection_source,
+        key="projection_editor",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "name": st.column_config.TextColumn("Course Name"),
+            "credits": st.column_config.SelectboxColumn("Credit Hours", options=[2, 3], default=3, required=True),
+            "mids": st.column_config.NumberColumn("Mids", min_value=0.0, step=0.5, default=0.0),
+            "sectional": st.column_config.NumberColumn("Sectional", min_value=0.0, step=0.5, help="Leave empty if still pending"),
         }
-        </style>
-    """, unsafe_allow_html=True)
+    )
+    # Cleared cells come back as NaN (or None), which is truthy, so `or` can't default them
+    pending = tuple(
+        (row["name"] if pd.notna(row["name"]) and row["name"] else f"Course {i}", int(row["credits"]),
+         float(row["mids"]) if pd.notna(row["mids"]) else 0.0,
+         float(row["sectional"]) if pd.notna(row["sectional"]) else None)
+        for i, row in enumerate(pending_rows.to_dict("records"), 1)
+        if pd.notna(row["credits"])
+    )
+    
+    # Courses already graded in the calculator count towards the GPA too
+    completed = ()
+    course_inputs = st.session_state.get("course_inputs")
+    transcript = st.session_state.get("transcript")
+    if course_inputs and transcript and st.checkbox("Include courses from the calculator", value=True, key="projection_completed"):
+        completed = tuple((course.credit_hours, course.quality_points) for course in transcript.update(course_inputs))
+    
+    # Least marks still needed for a target, instead of guessing finals one rerun at a time
+    target = st.number_input("Target GPA", min_value=0.0, max_value=4.0, value=3.0, step=0.1, key="projection_target")
+    if pending:
+        try:
+            plan = plan_target(scale, exact, round(target, 2), pending, completed)
+        except ValueError as error:
+            st.error(str(error))
+        else:
+            st.markdown(f"**Marks needed for a {target:.2f} GPA**")
+            if plan is None:
+                st.warning("Not reachable even with full marks in every pending final and sectional")
+            else:
+                st.table(pd.DataFrame(plan))
+    
+    source = st.radio("Pending Marks", options=["Assumed", "Fitted to past results"], horizontal=True, key="projection_source_kind")
+    fitted = None
+    fitted_id = None
+    if source == "Assumed":
+        col_f1, col_f2, col_s1, col_s2 = st.columns(4)
+        final_mean = col_f1.slider("Final: expected %", 5, 95, 60, key="final_mean")
+        final_sd = col_f2.slider("Final: spread %", 1, 40, 15, key="final_sd")
+        sectional_mean = col_s1.slider("Sectional: expected %", 5, 95, 75, key="sectional_mean")
+        sectional_sd = col_s2.slider("Sectional: spread %", 1, 40, 15, key="sectional_sd")
+        distributions = ((final_mean / 100, final_sd / 100), (sectional_mean / 100, sectional_sd / 100))
+    else:
+        history = st.file_uploader(
+            "Past Enrollments (CSV/Parquet)",
+            type=["csv", "parquet"],
+            key="projection_history",
+            help="Columns: credits, final, sectional (e.g. last year's cohort)"
+        )
+        if history is None:
+            st.info("Upload past results to fit the pending marks to")
+            return
+        try:
+            fitted = get_fitted_marks(history.file_id, history, scale)
+        except Exception as error:
+            st.error(f"Could not fit {history.name}: {error}")
+            return
+        fitted_id = history.file_id
+        distributions = ("fitted", fitted_id)
+    
+    samples = st.select_slider(
+        "Samples", options=[100_000, 250_000, 500_000, 1_000_000, 2_000_000], value=250_000,
+        format_func="{:,}".format, key="projection_samples"
+    )
+    if not pending:
+        st.info("Add the courses whose finals are still pending")
+        return
+    
+    try:
+        simulation = run_projection(scale, exact, pending, completed, distributions, samples, _fitted=fitted)
+    except ValueError as error:
+        st.error(str(error))
+        return
+    
+    quantiles = simulation.quantiles((0.05, 0.5, 0.95))
+    col_m1, col_m2, col_m3 = st.columns(3)
+    col_m1.metric("Median GPA", f"{quantiles[0.5]:.2f}")
+    col_m2.metric("Mean GPA", f"{simulation.mean:.2f}")
+    col_m3.metric("90% Range", f"{quantiles[0.05]:.2f} – {quantiles[0.95]:.2f}")
+    
+    thresholds = sorted({2.0, 2.5, 3.0, 3.5, round(target, 2)})
+    columns = st.columns(len(thresholds))
+    for column, threshold in zip(columns, thresholds):
+        column.metric(f"P(GPA ≥ {threshold:.2f})", f"{simulation.probability_at_least(threshold):.1%}")
+    
+    st.bar_chart(simulation.histogram(0.05).set_index("gpa"))
+
+def render_analytics(scale, exact=False):
+    """Grade distributions, pass rates and GPA histogram for a whole cohort.
+    
+    Only the small precomputed aggregate tables are read on each rerun,
+    so the charts stay interactive however many enrollments are loaded.
+    """
+    st.subheader("📈 Cohort Analytics")
+    uploaded = st.file_uploader(
+        "Enrollment File (CSV/Parquet)",
+        type=["csv", "parquet"],
+        key="cohort_upload",
+        help="Columns: student_id, course, section (optional), credits, and mids/final/sectional or grade"
+    )
+    if uploaded is None:
+        st.info("Upload an enrollment file to see grade distributions")
+        return
+    
+    try:
+        aggregates = get_cohort_aggregates(uploaded.file_id, uploaded, scale, exact)
+    except Exception as error:
+        st.error(f"Could not grade {uploaded.name}: {error}")
+        return
+    
+    col_c1, col_c2, col_c3 = st.columns(3)
+    col_c1.metric("Enrollments", f"{aggregates.enrollments:,}")
+    col_c2.metric("Students", f"{len(aggregates.totals.students):,}")
+    col_c3.metric("Courses", f"{len(aggregates.courses()):,}")
+    
+    # Course and section filters
+    course = st.selectbox("Course", options=["All courses"] + aggregates.courses(), key="cohort_course")
+    course = None if course == "All courses" else course
+    section = None
+    if course is not None:
+        sections = aggregates.sections(course)
+        if len(sections) > 1:
+            section = st.selectbox("Section", options=["All sections"] + sections, key="cohort_section")
+            section = None if section == "All sections" else section
+    
+    bands = aggregates.band_table(course, section)
+    enrolled = int(bands["count"].sum())
+    passed = int(bands.loc[bands["grade_points"] > 0, "count"].sum())
+    st.metric("Pass Rate", f"{passed / enrolled:.1%}" if enrolled else "–")
+    
+    col_l, col_b = st.columns(2)
+    with col_l:
+        st.markdown("**Letter Grades**")
+        st.bar_chart(aggregates.letter_table(course, section).set_index("letter"))
+    with col_b:
+        st.markdown("**Grade Points Bands**")
+        st.bar_chart(bands.assign(grade_points=bands["grade_points"].map("{:.2f}".format)).set_index("grade_points"))
+    
+    if course is None:
+        st.markdown("**Student GPA Distribution**")
+        st.bar_chart(aggregates.gpa_histogram().set_index("gpa"))
+    
+    st.markdown("**Courses**")
+    st.dataframe(aggregates.course_summary(), hide_index=True, use_container_width=True)
 
 def main():
     st.set_page_config(
@@ -260,13 +442,52 @@ def main():
     st.title("📚 GPA Calculator")
     st.markdown("Calculate your GPA using **Grade-based** or **Marks-based** input")
     
+    # Grading scale, selectable when more than one is registered
+    scale_names = registry.names()
+    if len(scale_names) > 1:
+        scale = st.selectbox(
+            "Grading Scale",
+            options=scale_names,
+            index=scale_names.index("gcuf") if "gcuf" in scale_names else 0,
+            format_func=lambda name: registry.get(name).title,
+            key="grading_scale"
+        )
+    else:
+        scale = scale_names[0]
+    mode = st.sidebar.radio("Mode", options=["🧮 Calculator", "📈 Cohort Analytics", "🎲 GPA Projection"], key="app_mode")
+    exact = st.sidebar.checkbox(
+        "Exact Grading",
+        key="exact_grading",
+        help="Grade in integer hundredths of marks, so e.g. 32.4/60 counts as exactly 54%"
+    )
+    calculator = get_grading_cache(scale, exact)
+    
+    # Hot-path timers, only when the app runs with GPA_INSTRUMENT set
+    if instrumentation.ENABLED:
+        with st.sidebar.expander("⏱️ Metrics (up to last rerun)"):
+            st.json(instrumentation.snapshot())
+            if st.button("Reset Metrics", key="reset_metrics"):
+                instrumentation.reset()
+    if "📈" in mode:
+        render_analytics(scale, exact)
+        return
+    if "🎲" in mode:
+        render_projection(scale, exact)
+        return
+    
     # Initialize session state
-    if 'calculator' not in st.session_state:
-        st.session_state.calculator = GPACalculator()
+    if 'transcript' not in st.session_state or st.session_state.transcript.calculator is not calculator:
+        st.session_state.transcript = TranscriptTracker(calculator)
     
     if 'course_inputs' not in st.session_state:
         st.session_state.course_inputs = []
     
+    if 'next_course_id' not in st.session_state:
+        st.session_state.next_course_id = 0
+    
+    if 'editor_version' not in st.session_state:
+        st.session_state.editor_version = 0
+    
     if 'show_transcript' not in st.session_state:
         st.session_state.show_transcript = False
     
@@ -289,135 +510,33 @@ def main():
         st.markdown(f"<span class='course-badge'>📚 Courses Added: {course_count}</span>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
         
-        # Display all course input boxes
+        # Course editor: paginated cards, or one bulk table
+        editor_mode = st.radio(
+            "Editor:",
+            options=["🗂️ Cards", "📋 Table"],
+            horizontal=True,
+            key="editor_mode",
+            help="Table mode edits all courses in a single widget, which stays fast for long course lists"
+        )
+        
         if course_count > 0:
-            for i, course in enumerate(st.session_state.course_inputs, 1):
-                with st.container():
-                    st.markdown(f"<div class='course-container'>", unsafe_allow_html=True)
-                    
-                    # Show which method this course uses
-                    method_text = "🎯 Grade" if course.get('method') == 'grade' else "📊 Marks"
-                    st.markdown(f"**Course {i}** <span class='method-indicator'>{method_text}</span>", unsafe_allow_html=True)
-                    
-                    # Course Name
-                    st.session_state.course_inputs[i-1]["name"] = st.text_input(
-                        "Course Name", 
-                        value=course["name"],
-                        key=f"name_{i}",
-                        placeholder="e.g., Mathematics"
-                    )
-                    
-                    # Credit Hours
-                    credit_options = [1, 2, 3, 4]
-                    default_index = credit_options.index(course["credits"]) if course["credits"] in credit_options else 2
-                    
-                    st.session_state.course_inputs[i-1]["credits"] = st.selectbox(
-                        "Credit Hours",
-                        options=credit_options,
-                        index=default_index,
-                        key=f"credits_{i}"
-                    )
-                    
-                    # Show different inputs based on course method
-                    if course.get('method') == 'grade':
-                        grade_options = ['A', 'B', 'C', 'D', 'F']
-                        grade_index = grade_options.index(course["grade"]) if course["grade"] in grade_options else 0
-                        
-                        selected_grade = st.selectbox(
-                            "Select Grade",
-                            options=grade_options,
-                            index=grade_index,
-                            key=f"grade_{i}",
-                            help="A=4.0, B=3.0, C=2.0, D=1.0, F=0.0"
-                        )
-                        st.session_state.course_inputs[i-1]["grade"] = selected_grade
-                        
-                    else:  # marks-based
-                        credits = st.session_state.course_inputs[i-1]["credits"]
-                        
-                        # Show appropriate marks fields based on credit hours
-                        if credits == 3:
-                            col_m1, col_m2, col_m3 = st.columns(3)
-                            with col_m1:
-                                mids = st.number_input(
-                                    "Mids (out of 20)",
-                                    min_value=0.0,
-                                    max_value=20.0,
-                                    value=course.get("mids", 0.0),
-                                    step=0.5,
-                                    key=f"mids_{i}"
-                                )
-                                st.session_state.course_inputs[i-1]["mids"] = mids
-                            
-                            with col_m2:
-                                final = st.number_input(
-                                    "Final (out of 30)",
-                                    min_value=0.0,
-                                    max_value=30.0,
-                                    value=course.get("final", 0.0),
-                                    step=0.5,
-                                    key=f"final_{i}"
-                                )
-                                st.session_state.course_inputs[i-1]["final"] = final
-                            
-                            with col_m3:
-                                sectional = st.number_input(
-                                    "Sectional (out of 10)",
-                                    min_value=0.0,
-                                    max_value=10.0,
-                                    value=course.get("sectional", 0.0),
-                                    step=0.5,
-                                    key=f"sectional_{i}"
-                                )
-                                st.session_state.course_inputs[i-1]["sectional"] = sectional
-                                
-                        elif credits == 2:
-                            col_m1, col_m2, col_m3 = st.columns(3)
-                            with col_m1:
-                                mids = st.number_input(
-                                    "Mids (out of 15)",
-                                    min_value=0.0,
-                                    max_value=15.0,
-                                    value=course.get("mids", 0.0),
-                                    step=0.5,
-                                    key=f"mids_{i}"
-                                )
-                                st.session_state.course_inputs[i-1]["mids"] = mids
-                            
-                            with col_m2:
-                                final = st.number_input(
-                                    "Final (out of 20)",
-                                    min_value=0.0,
-                                    max_value=20.0,
-                                    value=course.get("final", 0.0),
-                                    step=0.5,
-                                    key=f"final_{i}"
-                                )
-                                st.session_state.course_inputs[i-1]["final"] = final
-                            
-                            with col_m3:
-                                sectional = st.number_input(
-                                    "Sectional (out of 5)",
-                                    min_value=0.0,
-                                    max_value=5.0,
-                                    value=course.get("sectional", 0.0),
-                                    step=0.5,
-                                    key=f"sectional_{i}"
-                                )
-                                st.session_state.course_inputs[i-1]["sectional"] = sectional
-                        else:
-                            # Generic for other credit hours
-                            total = st.number_input(
-                                "Total Marks Obtained",
-                                min_value=0.0,
-                                max_value=100.0,
-                                value=course.get("obtained", 0.0),
-                                step=0.5,
-                                key=f"obtained_{i}"
-                            )
-                            st.session_state.course_inputs[i-1]["obtained"] = total
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
+            if "📋 Table" in editor_mode:
+                render_course_table(calculator)
+            else:
+                # Only the current page's widgets are rendered on each rerun
+                pages = (course_count - 1) // COURSES_PER_PAGE + 1
+                page = 1
+                jump_to_last_page = st.session_state.pop("jump_to_last_page", False)
+                if pages > 1:
+                    # The widget's value= only applies on its first render, so the
+                    # page is set through session state before the widget: last page
+                    # at first and after adding courses, clamped after removing some
+                    if jump_to_last_page or st.session_state.get("course_page", pages + 1) > pages:
+                        st.session_state.course_page = pages
+                    page = st.number_input("Page", min_value=1, max_value=pages, step=1, key="course_page")
+                start = (page - 1) * COURSES_PER_PAGE
+                for i, course in enumerate(st.session_state.course_inputs[start:start + COURSES_PER_PAGE], start + 1):
+                    render_course_card(calculator, course, i)
         else:
             st.info("👆 Click 'Add Course' to start adding courses")
     
@@ -428,22 +547,12 @@ def main():
         if st.button("➕ Add Course", use_container_width=True):
             if "🎯 Grade" in input_method:
                 # Add grade-based course
-                st.session_state.course_inputs.append({
-                    "name": "", 
-                    "credits": 3, 
-                    "grade": "A",
-                    "method": "grade"
-                })
+                st.session_state.course_inputs.append(new_course("grade"))
             else:
                 # Add marks-based course
-                st.session_state.course_inputs.append({
-                    "name": "", 
-                    "credits": 3, 
-                    "mids": 0.0,
-                    "final": 0.0,
-                    "sectional": 0.0,
-                    "method": "marks"
-                })
+                st.session_state.course_inputs.append(new_course("marks"))
+            courses_changed()
+            show_last_page()
             st.rerun()
         
         # Calculate button
@@ -457,6 +566,8 @@ def main():
         if st.button("🔄 Reset All", use_container_width=True):
             st.session_state.course_inputs = []
             st.session_state.show_transcript = False
+            st.session_state.pop("import_messages", None)
+            courses_changed()
             st.rerun()
         
         # Remove Last Course button
@@ -465,7 +576,38 @@ def main():
                 st.session_state.course_inputs.pop()
                 if len(st.session_state.course_inputs) == 0:
                     st.session_state.show_transcript = False
+                courses_changed()
                 st.rerun()
+        
+        # Bulk import: all rows are validated and added in a single rerun
+        uploaded = st.file_uploader(
+            "📥 Import Courses (CSV/Excel)",
+            type=["csv", "xlsx"],
+            key="course_upload",
+            help="Columns: Course Name, Credit Hours, and either Grade or Mids/Final/Sectional (Total for other credit hours)"
+        )
+        if uploaded is not None and st.session_state.get("imported_file") != uploaded.file_id:
+            st.session_state.imported_file = uploaded.file_id
+            try:
+                imported, errors = parse_course_frame(read_course_file(uploaded, uploaded.name), calculator)
+            except Exception as error:
+                imported, errors = [], [f"Could not read {uploaded.name}: {error}"]
+            st.session_state.course_inputs.extend(
+                new_course(course.pop("method"), **course) for course in imported
+            )
+            st.session_state.import_messages = (len(imported), errors)
+            if imported:
+                st.session_state.show_transcript = True
+            courses_changed()
+            show_last_page()
+            st.rerun()
+        
+        if "import_messages" in st.session_state:
+            count, errors = st.session_state.import_messages
+            if count:
+                st.success(f"Imported {count} courses")
+            if errors:
+                st.warning("Skipped rows:\n\n" + "\n\n".join(errors[:20]) + (f"\n\n…and {len(errors) - 20} more" if len(errors) > 20 else ""))
     
     st.markdown("---")
     
@@ -473,41 +615,11 @@ def main():
     st.header("📊 GPA Transcript")
     
     if st.session_state.show_transcript and st.session_state.course_inputs:
-        # Process all courses
-        courses = []
-        total_quality_points = 0
-        total_credits = 0
-        
-        for input_data in st.session_state.course_inputs:
-            if input_data["name"]:
-                if input_data.get('method') == 'grade':
-                    course = st.session_state.calculator.calculate_from_grade(
-                        input_data["name"],
-                        input_data["credits"],
-                        input_data["grade"]
-                    )
-                else:  # marks-based
-                    if input_data["credits"] in [2, 3]:
-                        course = st.session_state.calculator.calculate_from_marks(
-                            input_data["name"],
-                            input_data["credits"],
-                            input_data.get("mids", 0),
-                            input_data.get("final", 0),
-                            input_data.get("sectional", 0)
-                        )
-                    else:
-                        # Generic calculation for other credit hours
-                        course = st.session_state.calculator.calculate_from_marks(
-                            input_data["name"],
-                            input_data["credits"],
-                            input_data.get("obtained", 0),
-                            0,
-                            0
-                        )
-                
-                courses.append(course)
-                total_quality_points += course.quality_points
-                total_credits += course.credit_hours
+        # Only courses whose inputs changed since the last rerun are regraded
+        transcript = st.session_state.transcript
+        courses = transcript.update(st.session_state.course_inputs)
+        total_quality_points = transcript.total_quality_points
+        total_credits = transcript.total_credits
         
         if courses:
             # Course table
@@ -527,19 +639,51 @@ def main():
                     "Percentage": f"{course.percentage:.1f}%"
                 })
             
-            df = pd.DataFrame(table_data)
-            st.table(df)
+            # pandas is only imported once a transcript is actually rendered
+            with instrumentation.span("app.transcript_frame"):
+                import pandas as pd
+                df = pd.DataFrame(table_data)
+            with instrumentation.span("app.render_table"):
+                st.table(df)
             
             st.markdown("")
             
             # Summary
-            gpa = total_quality_points / total_credits if total_credits > 0 else 0
+            gpa = transcript.gpa
             
             st.markdown(f"**Total Quality Points**: {total_quality_points:.2f}")
             st.markdown("")
             st.markdown(f"**Total Credits**: {total_credits:.0f}")
             st.markdown("")
             st.markdown(f"**GPA**: {gpa:.2f}")
+            
+            # Downloadable copies of this transcript
+            from functools import partial
+            from gpa_calculator.export import FORMATS, transcript_filename
+            st.markdown("**Download Transcript**")
+            col_name, col_roll = st.columns(2)
+            with col_name:
+                student_name = st.text_input("Student Name", key="student_name")
+            with col_roll:
+                roll_number = st.text_input("Roll Number", key="roll_number")
+            # Documents are only rendered when a button is clicked (and then
+            # cached), not on every rerun; the GPA is rounded like the tracker's
+            course_rows = tuple(
+                (course.name, course.credit_hours, course.grade_value, course.grade_letter,
+                 course.quality_points, course.input_method, course.percentage)
+                for course in courses
+            )
+            download_columns = st.columns(len(FORMATS))
+            for column, fmt in zip(download_columns, FORMATS):
+                with column:
+                    st.download_button(
+                        f"⬇️ {fmt.upper()}",
+                        data=partial(render_transcript, fmt, roll_number or "-", student_name or None, course_rows, exact),
+                        file_name=transcript_filename(roll_number or "transcript", fmt),
+                        mime=DOWNLOAD_TYPES[fmt],
+                        key=f"download_{fmt}",
+                        use_container_width=True
+                    )
         else:
             st.info("Please enter course names for all courses")
     
@@ -549,4 +693,9 @@ def main():
         st.info("Add courses and click 'Calculate GPA' to see your transcript")
 
 if __name__ == "__main__":
-    main()
+    # Every widget interaction reruns the script; time (and with
+    # GPA_PROFILE set, profile) each rerun as a whole
+    instrumentation.count("app.reruns")
+    with instrumentation.profile("rerun"), instrumentation.span("app.rerun"):
+        main()
+    instrumentation.flush()
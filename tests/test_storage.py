@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+from gpa_calculator import GPACalculator
+from gpa_calculator.storage import TranscriptStore
+
+@pytest.fixture
+def store(tmp_path):
+    with TranscriptStore(str(tmp_path / "transcripts.sqlite")) as store:
+        yield store
+
+def graded(terms):
+    frame = pd.DataFrame({
+        'student_id': ['1', '1'],
+        'course': ['Math', 'Physics'],
+        'credits': [3, 3],
+        'grade': ['A', 'B'],
+        'term': terms,
+    })
+    return GPACalculator().grade_frame(frame)
+
+def test_term_argument_overrides_term_column(store):
+    store.add_frame(graded(['Fall', 'Spring']), term='Summer')
+    assert [row[0] for row in store.student_courses('1')] == ['Summer', 'Summer']
+
+def test_term_argument_fills_blank_term_cells(store):
+    store.add_frame(graded(['Fall', None]), term='Summer')
+    assert [row[0] for row in store.student_courses('1')] == ['Summer', 'Summer']
+
+def test_term_column_used_without_term_argument(store):
+    store.add_frame(graded(['Fall', 'Spring']))
+    assert [row[0] for row in store.student_courses('1')] == ['Fall', 'Spring']
+
+def test_blank_term_cell_without_term_argument_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.add_frame(graded(['Fall', None]))
+    assert store.student_courses('1') == []